@@ -0,0 +1,85 @@
+"""Caller-side cost of a timing log line: print() vs the queue-backed JSON logger.
+
+Usage: python -m benchmarks.logging_overhead [--threads 16] [--lines 20000] [--sample-rate 1.0] [--sink pipe]
+
+--sink devnull measures the pure hot-path cost; --sink pipe writes through a pipe to
+a separate reader, which is closer to a container's stdout log driver.
+"""
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+
+def run_threads(threads, lines, emit):
+    per_call = []
+    lock = threading.Lock()
+
+    def worker():
+        samples = []
+        for i in range(lines):
+            start = time.perf_counter_ns()
+            emit(i)
+            samples.append(time.perf_counter_ns() - start)
+        with lock:
+            per_call.extend(samples)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+
+    per_call.sort()
+    return {
+        "wall_s": round(elapsed, 3),
+        "median_us": round(statistics.median(per_call) / 1000, 2),
+        "p99_us": round(per_call[int(len(per_call) * 0.99)] / 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--sample-rate", default="1.0")
+    parser.add_argument("--sink", choices=["devnull", "pipe"], default="devnull")
+    args = parser.parse_args()
+
+    os.environ["LOG_TIMING_SAMPLE_RATE"] = args.sample_rate
+    from services.logger import configure_logging, request_id, log_timing
+
+    if args.sink == "pipe":
+        reader = subprocess.Popen(["cat"], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True)
+        sink = reader.stdin
+    else:
+        sink = open(os.devnull, "w")
+    real_stdout = sys.stdout
+
+    sys.stdout = sink
+    print_result = run_threads(
+        args.threads, args.lines,
+        lambda i: print(f"Textract API call took: {round(i / 1000, 2)} seconds")
+    )
+    sys.stdout = real_stdout
+
+    configure_logging(sink)
+    logger = logging.getLogger("benchmark")
+    request_id.set("APP-BENCHMARK")
+    logger_result = run_threads(
+        args.threads, args.lines,
+        lambda i: log_timing(logger, "Textract API call took", i)
+    )
+
+    print(f"print():      {print_result}")
+    print(f"JSON logger:  {logger_result}")
+
+
+if __name__ == "__main__":
+    main()
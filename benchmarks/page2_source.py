@@ -0,0 +1,63 @@
+"""Compare page-2 latency when the PAN card is read from the PDF text layer vs OCR.
+
+Usage: python -m benchmarks.page2_source documents/ [--runs 5] [--textract]
+
+Without --textract only the local part of the OCR path (rasterize + JPEG encode) is
+timed, so the reported saving is a lower bound for digital inputs.
+"""
+import argparse
+import resource
+import statistics
+import time
+from io import BytesIO
+from pathlib import Path
+from core.extraction import extract_page2_text_layer_sync, fields_complete
+from core.pipeline import Pipeline, Document
+from core.rendering import render_page_jpeg
+from core.templates import PAN_APPLICATION_V1
+
+
+def time_ms(func, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--textract", action="store_true", help="include the Textract call in the OCR path")
+    args = parser.parse_args()
+
+    if args.textract:
+        from core.providers import aws_services
+        pipeline = Pipeline(*aws_services())
+
+    files = sorted(args.path.glob("*.pdf")) if args.path.is_dir() else [args.path]
+    digital = 0
+    for path in files:
+        pdf_data = path.read_bytes()
+        has_text_layer = fields_complete(extract_page2_text_layer_sync(BytesIO(pdf_data)))
+        digital += has_text_layer
+
+        layer_ms = time_ms(lambda: extract_page2_text_layer_sync(BytesIO(pdf_data)), args.runs)
+        if args.textract:
+            document = Document(pdf_data, PAN_APPLICATION_V1)
+            ocr_ms = time_ms(lambda: pipeline.run_stage("page2_textract", document), args.runs)
+        else:
+            ocr_ms = time_ms(lambda: render_page_jpeg(pdf_data, 2), args.runs)
+
+        source = "text_layer" if has_text_layer else "textract"
+        saving = ocr_ms - layer_ms if has_text_layer else 0
+        print(f"{path.name}: source={source} text_layer={layer_ms:.1f}ms ocr={ocr_ms:.1f}ms saving={saving:.1f}ms")
+
+    print(f"{digital}/{len(files)} documents served from the text layer")
+    print(f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
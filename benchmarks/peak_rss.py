@@ -0,0 +1,81 @@
+"""Peak RSS of the local rendering stages under concurrency, with and without the memory budget.
+
+Usage: python -m benchmarks.peak_rss documents/ [--concurrency 16] [--repeat 4] [--budget-mb 256]
+
+Runs page-2 rasterization and face-image preparation (no AWS calls) for every PDF,
+`repeat` times, with `concurrency` documents in flight. Run once per setting: peak RSS
+is a process-wide high-water mark.
+"""
+import argparse
+import asyncio
+import resource
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from core.rendering import render_page_jpeg, prepare_images_sync
+from core.templates import identify_template
+from services.memory_budget import MemoryBudget, estimate_footprint
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def render_document(pdf_data, template):
+    render_page_jpeg(pdf_data, template.roles["id_card"])
+    prepare_images_sync(pdf_data, template.image_pages)
+
+
+async def run(documents, concurrency, budget):
+    loop = asyncio.get_event_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(pdf_data, template):
+        async with semaphore:
+            if budget is None:
+                await loop.run_in_executor(executor, render_document, pdf_data, template)
+                return
+            async with budget.reserve(estimate_footprint(pdf_data, template), timeout=None):
+                await loop.run_in_executor(executor, render_document, pdf_data, template)
+
+    await asyncio.gather(*(one(pdf_data, template) for pdf_data, template in documents))
+    executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=4)
+    parser.add_argument("--budget-mb", type=int, help="gate documents through a MemoryBudget of this size")
+    args = parser.parse_args()
+
+    files = sorted(args.path.glob("*.pdf")) if args.path.is_dir() else [args.path]
+    documents = []
+    for path in files:
+        pdf_data = path.read_bytes()
+        template, error = identify_template(pdf_data)
+        if template is None:
+            print(f"skipping {path.name}: {error}")
+            continue
+        documents.append((pdf_data, template))
+    documents *= args.repeat
+
+    budget = MemoryBudget(args.budget_mb * 1024 * 1024) if args.budget_mb else None
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    asyncio.run(run(documents, args.concurrency, budget))
+    elapsed = time.perf_counter() - start
+
+    print(f"documents={len(documents)} concurrency={args.concurrency} budget_mb={args.budget_mb}")
+    print(f"throughput={len(documents) / elapsed:.2f} docs/s peak_rss={peak_rss_mb():.1f} MB (baseline {baseline:.1f} MB)")
+    if budget is not None:
+        print(f"budget peak reserved={budget.peak / (1024 * 1024):.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
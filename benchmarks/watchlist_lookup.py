@@ -0,0 +1,94 @@
+"""Watchlist name lookup latency and index memory.
+
+Usage: python -m benchmarks.watchlist_lookup [--names 1000000] [--queries 300] [--watchlist names.csv]
+
+Without --watchlist a deterministic synthetic list is generated from common Indian
+first names and surnames, which is close to the worst case: every gram is frequent.
+Queries are split into names present in the list, the same names with one typo,
+and names built from the same tokens that may not be present.
+"""
+import argparse
+import csv
+import random
+import statistics
+import time
+import tracemalloc
+from services.watchlist import ScreeningIndex
+
+FIRST = (
+    "RAHUL PRIYA AMIT SUNITA ANJALI RAJESH SURESH RAMESH MAHESH DINESH SANJAY VIJAY AJAY ANIL SUNIL KAVITA "
+    "POOJA NEHA RITU SONIA DEEPAK MANOJ ARUN KIRAN RAVI SHYAM MOHAN GOPAL KRISHNA RADHA SITA GITA LAKSHMI "
+    "MEENA REKHA ASHOK ALOK VIVEK VIKAS VIKRAM ARJUN KARAN ROHIT MOHIT SUMIT NITIN SACHIN RAHIM SALMAN "
+    "IMRAN FATIMA AYESHA ZAINAB HARPREET GURPREET MANPREET JASPREET SURINDER RAJINDER PARAMJIT ABHISHEK "
+    "ADITYA AKASH ANKIT ANKITA DIVYA GAURAV HARSH ISHA JYOTI KAJAL KOMAL MANISHA NIKHIL PANKAJ PRAKASH "
+    "PREETI RAKESH SANDEEP SANGEETA SAURABH SHALINI SHWETA SUMAN SWATI TARUN UMESH VARUN VINOD YOGESH"
+).split()
+LAST = (
+    "KUMAR SHARMA SINGH VERMA GUPTA PATEL SHAH MEHTA JOSHI IYER IYENGAR NAIR MENON PILLAI REDDY RAO NAIDU "
+    "CHOWDHURY BANERJEE CHATTERJEE MUKHERJEE GHOSH BOSE DAS DUTTA SEN ROY KHAN SHAIKH ANSARI QURESHI "
+    "YADAV MISHRA TIWARI PANDEY DUBEY TRIPATHI SRIVASTAVA SAXENA AGARWAL JAIN BANSAL GOYAL KAPOOR KHANNA "
+    "MALHOTRA CHOPRA ARORA BHATIA SETHI GILL SANDHU DHILLON KAUR DESAI PATIL KULKARNI JADHAV PAWAR THAKUR"
+).split()
+LETTERS = "ABCDEFGHIKLMNOPRSTUVY"
+
+
+def synthetic_name(rng):
+    parts = [rng.choice(FIRST)] + ([rng.choice(FIRST)] if rng.random() < 0.3 else []) + [rng.choice(LAST)]
+    return typo(" ".join(parts), rng) if rng.random() < 0.2 else " ".join(parts)
+
+
+def typo(name, rng):
+    i = rng.randrange(len(name))
+    return name[:i] + rng.choice(LETTERS) + name[i + 1:]
+
+
+def load_names(args):
+    if args.watchlist:
+        with open(args.watchlist, newline="") as f:
+            return [row[0] for row in csv.reader(f) if row]
+    rng = random.Random(1)
+    return [synthetic_name(rng) for _ in range(args.names)]
+
+
+def report(label, index, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        index.lookup_name(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    print(
+        f"{label:<8} mean={statistics.mean(samples):.2f}ms p50={samples[len(samples) // 2]:.2f}ms "
+        f"p90={samples[int(len(samples) * 0.9)]:.2f}ms max={samples[-1]:.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--names", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--watchlist", help="CSV of name,entry_id; replaces the synthetic list")
+    parser.add_argument("--max-scan", type=int, help="override WATCHLIST_MAX_SCAN (0: no cap)")
+    args = parser.parse_args()
+
+    names = load_names(args)
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = ScreeningIndex() if args.max_scan is None else ScreeningIndex(max_scan=args.max_scan)
+    index.add_watchlist_names((name, str(i)) for i, name in enumerate(names))
+    build_seconds = time.perf_counter() - start
+    index_mb = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+    tracemalloc.stop()
+    print(f"{len(names)} names ({index.stats()['distinct_watchlist_names']} distinct) "
+          f"indexed in {build_seconds:.1f}s, {index_mb:.0f} MB")
+
+    rng = random.Random(9)
+    present = [rng.choice(names) for _ in range(args.queries)]
+    report("present", index, present)
+    report("typo", index, [typo(name, rng) for name in present])
+    report("tokens", index, [synthetic_name(rng) for _ in range(args.queries)])
+    print(f"partial lookups: {index.stats()['partial_name_lookups']}")
+
+
+if __name__ == "__main__":
+    main()
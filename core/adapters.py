@@ -0,0 +1,101 @@
+import base64
+import json
+from abc import ABC, abstractmethod
+from email.parser import BytesParser
+from email.policy import HTTP
+
+
+class InvalidDocument(Exception):
+    pass
+
+
+class RequestAdapter(ABC):
+    # Translates between an entry point's request/response objects and the pipeline
+
+    @abstractmethod
+    async def read_document(self) -> bytes:
+        # Return the uploaded PDF bytes or raise InvalidDocument
+        pass
+
+    @abstractmethod
+    def query(self, name: str, default=None):
+        pass
+
+    @abstractmethod
+    def respond(self, status: int, body: dict, headers: dict = None):
+        pass
+
+
+class QuartRequestAdapter(RequestAdapter):
+    def __init__(self, request):
+        self.request = request
+
+    async def read_document(self):
+        files = await self.request.files
+        file = files.get("file")
+        if not file or not file.filename.endswith(".pdf"):
+            raise InvalidDocument("Upload a PDF file")
+        return file.read()
+
+    def query(self, name, default=None):
+        return self.request.args.get(name, default)
+
+    def respond(self, status, body, headers=None):
+        # Quart serializes a returned dict as JSON
+        return body, status, headers or {}
+
+
+class ApiGatewayAdapter(RequestAdapter):
+    def __init__(self, event: dict):
+        self.event = event
+
+    async def read_document(self):
+        try:
+            return parse_pdf(self.event)
+        except Exception as e:
+            raise InvalidDocument(f"Invalid PDF: {str(e)}")
+
+    def query(self, name, default=None):
+        return (self.event.get("queryStringParameters") or {}).get(name, default)
+
+    def respond(self, status, body, headers=None):
+        response = {"statusCode": status, "body": json.dumps(body)}
+        if headers:
+            response["headers"] = headers
+        return response
+
+
+def sanity_check(file_bytes: bytes):
+    # python-magic (libmagic) is only installed in the Lambda image
+    import magic
+
+    if not file_bytes.startswith(b'%PDF-'):
+        return False
+
+    mime = magic.from_buffer(file_bytes, mime=True)
+    return mime == "application/pdf"
+
+
+def parse_pdf(event: dict):
+    if event.get("httpMethod") != "POST":
+        raise Exception("Only POST method Supported")
+
+    content_type = event['headers'].get('Content-Type') or event['headers'].get('content-type')
+    body = base64.b64decode(event['body']) if event['isBase64Encoded'] else event['body'].encode()
+
+    # multipart/form-data is MIME; the email parser replaces cgi.FieldStorage (removed in 3.13)
+    message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+    fields = {}
+    if message.is_multipart():
+        fields = {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+
+    if 'file' not in fields:
+        raise Exception("Missing 'file' field in form")
+
+    file_data = fields['file'].get_payload(decode=True) or b""
+
+    if not sanity_check(file_data):
+        raise Exception("Invalid file type")
+
+    # Page count and layout are checked by templates.identify_template
+    return file_data
@@ -0,0 +1,105 @@
+import time
+import threading
+from collections import deque
+from core.config import (
+    BREAKER_FAILURE_RATE, BREAKER_MIN_CALLS, BREAKER_WINDOW,
+    BREAKER_SLOW_CALL_MS, BREAKER_OPEN_SECONDS
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class DependencyUnavailable(Exception):
+    def __init__(self, dependency: str):
+        super().__init__(f"{dependency} is unavailable")
+        self.dependency = dependency
+
+
+class CircuitBreaker:
+    # Trips when the share of failed or slow calls in the last `window` calls reaches
+    # `failure_rate`; after `open_seconds` a single probe call decides whether to close.
+    # `is_failure` decides which exceptions count against the dependency; the others
+    # are re-raised without being recorded.
+
+    def __init__(self, name: str, failure_rate: float = BREAKER_FAILURE_RATE, min_calls: int = BREAKER_MIN_CALLS,
+                 window: int = BREAKER_WINDOW, slow_call_ms: float = BREAKER_SLOW_CALL_MS,
+                 open_seconds: float = BREAKER_OPEN_SECONDS, clock=time.monotonic, is_failure=lambda e: True):
+        self.name = name
+        self.is_failure = is_failure
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call_ms = slow_call_ms
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self._outcomes = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == OPEN and self.clock() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def check(self):
+        # Fail fast before doing any work for a call that would be rejected
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN or (state == HALF_OPEN and self._probe_in_flight):
+                raise DependencyUnavailable(self.name)
+
+    def call(self, func, *args, **kwargs):
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN or (state == HALF_OPEN and self._probe_in_flight):
+                raise DependencyUnavailable(self.name)
+            if state == HALF_OPEN:
+                self._probe_in_flight = True
+
+        start = self.clock()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self._record(False)
+            else:
+                self._release()
+            raise
+        self._record((self.clock() - start) * 1000 <= self.slow_call_ms)
+        return result
+
+    def _record(self, success: bool):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+                if success:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._trip()
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+                self._trip()
+
+    def _release(self):
+        # The call said nothing about the dependency; let another call probe it
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def _trip(self):
+        self._state = OPEN
+        self._opened_at = self.clock()
+        self._outcomes.clear()
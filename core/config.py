@@ -0,0 +1,48 @@
+import os
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    # python-dotenv is only installed for the Quart service; Lambda reads its environment directly
+    pass
+
+SIMILARITY_THRESHOLD = 80
+FACE_SIMILARITY_THRESHOLD = 0.7
+REKOGNITION_THRESHOLD = 70
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", 4))
+
+# Page rendering: the ID card page sent to Textract, and the ID card + selfie pages sent to Rekognition
+TEXTRACT_DPI = 150
+TEXTRACT_JPEG_QUALITY = 70
+FACE_DPI = 100
+FACE_JPEG_QUALITY = 75
+
+# "eager" launches every stage at once; "cost_aware" runs local checks first and only
+# calls Textract/Rekognition while they can still change the verdict
+SCHEDULING_MODE = os.getenv("SCHEDULING_MODE", "eager")
+# Launch remote stages anyway if local checks take longer than this (unset: always wait)
+SPECULATIVE_LAUNCH_MS = int(os.getenv("SPECULATIVE_LAUNCH_MS")) if os.getenv("SPECULATIVE_LAUNCH_MS") else None
+
+# Per-process LRU of stage results keyed by document digest (0 disables it)
+STAGE_CACHE_SIZE = int(os.getenv("STAGE_CACHE_SIZE", 0))
+
+# Raw Textract/Rekognition response store: "off", "record", "cache" or "replay".
+# One process holds the store's write lock; others only read, so recording every
+# response needs a single process (SERVER_WORKERS=1, revalidate.py --workers 1)
+RESPONSE_STORE_PATH = os.getenv("RESPONSE_STORE_PATH")
+RESPONSE_STORE_MODE = os.getenv("RESPONSE_STORE_MODE", "record")
+RESPONSE_STORE_SEGMENT_BYTES = 64 * 1024 * 1024
+
+# Circuit breakers around Textract and Rekognition
+BREAKER_FAILURE_RATE = 0.5
+BREAKER_MIN_CALLS = 10
+BREAKER_WINDOW = 20
+BREAKER_SLOW_CALL_MS = 5000
+BREAKER_OPEN_SECONDS = 30
+# botocore timeouts so a hung call fails (and counts against the breaker) instead of waiting
+AWS_CONNECT_TIMEOUT = int(os.getenv("AWS_CONNECT_TIMEOUT", 3))
+AWS_READ_TIMEOUT = int(os.getenv("AWS_READ_TIMEOUT", 15))
+
+# Fraction of high-volume timing lines (core/timing.py) that are written
+LOG_TIMING_SAMPLE_RATE = float(os.getenv("LOG_TIMING_SAMPLE_RATE", 1.0))
@@ -0,0 +1,75 @@
+import logging
+import re
+from pypdf import PdfReader
+
+logger = logging.getLogger(__name__)
+
+DATE_PATTERN = r"\d{1,2}[-/]\d{1,2}[-/]\d{4}"
+
+def extract_after_label(text, label_pattern, value_pattern):
+    pattern = re.compile(label_pattern + "(" + value_pattern + ")", re.IGNORECASE)
+    match = pattern.search(text)
+    return match.group(1).strip() if match else None
+
+def extract_fields_page1(text):
+    text = re.sub(r"[ ]{2,}", " ", text)
+    joined = "\n".join(text.splitlines())
+    fields = {
+        "pan": extract_after_label(joined, r"PAN NUMBER\s*", r"[A-Z]{5}[0-9]{4}[A-Z]"),
+        "name": extract_after_label(joined, r"FULL NAME\s*", r"[A-Z ]+"),
+        "dob": extract_after_label(joined, r"DATE OF BIRTH.*?\s*", DATE_PATTERN),
+    }
+    father_match = re.search(r"FATHER\s+NAME[\s\n]*([A-Z]+)[\s\n]*([A-Z]+)", joined)
+    if father_match:
+        fields["father_name"] = f"{father_match.group(1)} {father_match.group(2)}"
+    else:
+        fields["father_name"] = extract_after_label(joined, r"FATHER\s+NAME", r"[A-Z\s]+")
+    return fields
+
+PAGE2_FIELD_PATTERNS = {
+    "pan": r"[A-Z]{5}[0-9]{4}[A-Z]",
+    "name": r"[A-Z ]+",
+    "father_name": r"[A-Z ]+",
+    "dob": DATE_PATTERN,
+}
+
+def fields_complete(fields, patterns=PAGE2_FIELD_PATTERNS):
+    return all(
+        fields.get(f) and re.fullmatch(pattern, fields[f])
+        for f, pattern in patterns.items()
+    )
+
+def extract_fields_page2(text):
+    # OCR often splits or drops the "Date of Birth" label; fall back to the first date on the card
+    dob = extract_after_label(text, r"Date of Birth\s*[:\-]?\s*", DATE_PATTERN)
+    if dob is None:
+        dob_match = re.search(DATE_PATTERN, text)
+        dob = dob_match.group(0) if dob_match else None
+    return {
+        "pan": extract_after_label(text, r"Permanent Account Number Card\s*", r"[A-Z]{5}[0-9]{4}[A-Z]"),
+        "name": extract_after_label(text, r"Name\s*[:\-]?\s*", r"[A-Z ]+"),
+        "father_name": extract_after_label(text, r"Father'?s Name\s*[:\-]?\s*", r"[A-Z ]+"),
+        "dob": dob
+    }
+
+def extract_page1_sync(pdf_bytes, page=1, extractor=extract_fields_page1, page1_text=None):
+    # page1_text: the page's text when the caller has already extracted it
+    try:
+        if page1_text is None:
+            reader = PdfReader(pdf_bytes)
+            page1_text = reader.pages[page - 1].extract_text()
+        return extractor(page1_text)
+    except Exception:
+        logger.exception("Page 1 extraction error")
+        return {}
+
+def extract_page2_text_layer_sync(pdf_bytes, page=2, extractor=extract_fields_page2):
+    try:
+        reader = PdfReader(pdf_bytes)
+        if len(reader.pages) < page:
+            return {}
+        page2_text = reader.pages[page - 1].extract_text() or ""
+        return extractor(page2_text)
+    except Exception:
+        logger.exception("Page 2 text layer extraction error")
+        return {}
\ No newline at end of file
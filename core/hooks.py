@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+from core.config import STAGE_CACHE_SIZE
+
+# Returned by before_stage when the stage should run normally
+MISS = object()
+
+
+class PipelineHooks:
+    # Called around every stage the pipeline runs. before_stage may return a stored
+    # result to skip the stage; after_stage sees each result the stage produced.
+
+    def before_stage(self, stage, document):
+        return MISS
+
+    def after_stage(self, stage, document, result, duration_ms):
+        pass
+
+
+class HookChain(PipelineHooks):
+    def __init__(self, hooks=()):
+        self.hooks = list(hooks)
+
+    def before_stage(self, stage, document):
+        for hook in self.hooks:
+            result = hook.before_stage(stage, document)
+            if result is not MISS:
+                return result
+        return MISS
+
+    def after_stage(self, stage, document, result, duration_ms):
+        for hook in self.hooks:
+            hook.after_stage(stage, document, result, duration_ms)
+
+
+class StageTimings(PipelineHooks):
+    # Per-stage call count, total and worst duration since startup
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def after_stage(self, stage, document, result, duration_ms):
+        with self._lock:
+            count, total, worst = self._stats.get(stage, (0, 0, 0))
+            self._stats[stage] = (count + 1, total + duration_ms, max(worst, duration_ms))
+
+    def stats(self):
+        with self._lock:
+            return {
+                stage: {"count": count, "mean_ms": round(total / count, 1), "max_ms": worst}
+                for stage, (count, total, worst) in self._stats.items()
+            }
+
+
+class StageCache(PipelineHooks):
+    # LRU of stage results keyed by document digest and template, so a resubmitted
+    # document skips extraction and AWS calls. Failed stages ({} or None) are not kept.
+
+    def __init__(self, maxsize, stages=None):
+        self.maxsize = maxsize
+        self.stages = stages
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, stage, document):
+        return stage, document.template.name, document.digest
+
+    def before_stage(self, stage, document):
+        if self.stages is not None and stage not in self.stages:
+            return MISS
+        key = self._key(stage, document)
+        with self._lock:
+            if key not in self._entries:
+                return MISS
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def after_stage(self, stage, document, result, duration_ms):
+        if result in (None, {}) or (self.stages is not None and stage not in self.stages):
+            return
+        key = self._key(stage, document)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+def build_hooks(*hooks):
+    # The stage cache goes first so a hit skips the stage for every later hook
+    if STAGE_CACHE_SIZE:
+        hooks = (StageCache(STAGE_CACHE_SIZE),) + hooks
+    return HookChain(hooks)
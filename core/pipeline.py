@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import logging
+import time
+from contextvars import copy_context
+from functools import partial
+from io import BytesIO
+from core.config import SCHEDULING_MODE, SPECULATIVE_LAUNCH_MS
+from core.circuit_breaker import DependencyUnavailable
+from core.response_store import ReplayMiss
+from core.extraction import extract_page1_sync, extract_page2_text_layer_sync, fields_complete
+from core.hooks import PipelineHooks, MISS
+from core.rendering import render_page_jpeg, prepare_images_sync
+from core.templates import match_template
+from core import scheduler
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("page1", "page2_text_layer", "page2_textract", "face_match")
+
+
+class Document:
+    def __init__(self, pdf_data, template, page1_text=None):
+        self.pdf_data = pdf_data
+        self.template = template
+        # Page-1 text read while identifying the template, reused by the page1 stage
+        self.page1_text = page1_text
+        self._digest = None
+        # Stages a cost-aware run no longer needs, and their tasks: executor work cannot
+        # be interrupted, so a stage already rendering finishes after the run returns
+        self.abandoned = set()
+        self.background = []
+
+    @property
+    def digest(self):
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.pdf_data).hexdigest()
+        return self._digest
+
+
+def identify_document(pdf_data):
+    # Returns (document, None), or (None, error) for a PDF that matches no template
+    template, page1_text, error = match_template(pdf_data)
+    if template is None:
+        return None, error
+    return Document(pdf_data, template, page1_text), None
+
+
+class Pipeline:
+    # The validation stages shared by the Quart service, the Lambda handler and the
+    # batch tools. Text extraction and face comparison are pluggable services; hooks
+    # see every stage for caching and instrumentation. Stages run on `executor` when
+    # awaited and inline when called through run_sync.
+
+    def __init__(self, text_service, face_service, executor=None, hooks=None):
+        self.text_service = text_service
+        self.face_service = face_service
+        self.executor = executor
+        self.hooks = hooks or PipelineHooks()
+        self._stages = {
+            "page1": self._page1,
+            "page2_text_layer": self._page2_text_layer,
+            "page2_textract": self._page2_textract,
+            "face_match": self._face_match,
+        }
+
+    def _page1(self, document):
+        template = document.template
+        page1_text = document.page1_text if template.roles["form"] == 1 else None
+        return extract_page1_sync(
+            BytesIO(document.pdf_data), template.roles["form"], template.form_extractor, page1_text
+        )
+
+    def _page2_text_layer(self, document):
+        template = document.template
+        return extract_page2_text_layer_sync(BytesIO(document.pdf_data), template.roles["id_card"], template.id_extractor)
+
+    def _page2_textract(self, document):
+        # Fail fast before rendering while Textract's breaker is open
+        self.text_service.check()
+        try:
+            page_jpeg = render_page_jpeg(document.pdf_data, document.template.roles["id_card"])
+            text = self.text_service.extract_text_fields(page_jpeg)
+            return document.template.id_extractor(text)
+        except (DependencyUnavailable, ReplayMiss):
+            # Not a verdict on the document; the caller reports it
+            raise
+        except Exception:
+            logger.exception("Textract error")
+            return {}
+
+    def _face_match(self, document):
+        self.face_service.check()
+        img2_bytes, img3_bytes = prepare_images_sync(document.pdf_data, document.template.image_pages)
+        if img2_bytes is None or img3_bytes is None:
+            return None
+        try:
+            return self.face_service.compare_faces(img2_bytes, img3_bytes)
+        except (DependencyUnavailable, ReplayMiss):
+            raise
+        except Exception:
+            logger.exception("Rekognition error")
+            return None
+
+    def run_stage(self, stage, document):
+        if stage in document.abandoned:
+            # Still queued when the scheduler gave up on it
+            return None, 0
+        cached = self.hooks.before_stage(stage, document)
+        if cached is not MISS:
+            return cached, 0
+        start_time = time.time()
+        result = self._stages[stage](document)
+        duration_ms = int((time.time() - start_time) * 1000)
+        self.hooks.after_stage(stage, document, result, duration_ms)
+        return result, duration_ms
+
+    def run_page2(self, document):
+        # Digitally generated PAN cards carry a text layer; OCR only image-only pages
+        fields, layer_time = self.run_stage("page2_text_layer", document)
+        if fields_complete(fields, document.template.field_patterns):
+            return (fields, "text_layer"), layer_time
+        fields, ocr_time = self.run_stage("page2_textract", document)
+        return (fields, "textract"), layer_time + ocr_time
+
+    async def run_in_executor(self, func, *args):
+        # Carry contextvars (the request id) into the executor thread
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(copy_context().run, func, *args))
+
+    async def run_stage_async(self, stage, document):
+        return await self.run_in_executor(self.run_stage, stage, document)
+
+    async def run(self, document, mode=SCHEDULING_MODE, speculative_ms=SPECULATIVE_LAUNCH_MS):
+        if mode == "cost_aware":
+            return await scheduler.run_cost_aware(self, document, speculative_ms)
+        return await scheduler.run_eager(self, document)
+
+    def run_sync(self, document):
+        return scheduler.run_sync(self, document)
+
+
+def stage_metrics(stages):
+    page1_time = stages["page1"][1]
+    page2_time = stages["page2"][1]
+    return {
+        "page1_ocr_ms": page1_time,
+        "page2_textract_ms": page2_time,
+        "face_match_ms": stages["face"][1],
+        "ocr_ms": page1_time + page2_time
+    }
@@ -0,0 +1,119 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from core.circuit_breaker import CircuitBreaker
+from core.config import REKOGNITION_THRESHOLD, AWS_CONNECT_TIMEOUT, AWS_READ_TIMEOUT
+from core.response_store import fetch_response, image_key
+from core.timing import log_timing
+
+logger = logging.getLogger(__name__)
+
+
+class TextExtractionService(ABC):
+    @abstractmethod
+    def extract_text_fields(self, image_bytes: bytes):
+        pass
+
+    def check(self):
+        # Raise DependencyUnavailable when a call would be rejected; plain services never are
+        pass
+
+
+class FaceComparisonService(ABC):
+    @abstractmethod
+    def compare_faces(self, source_image: bytes, target_image: bytes):
+        pass
+
+    def check(self):
+        pass
+
+
+class AWSTextExtractionService(TextExtractionService):
+    def __init__(self, config=None):
+        import boto3
+        self.textract = boto3.client('textract', config=config)
+
+    def extract_text_fields(self, image_bytes: bytes):
+        start_time = time.time()
+        result = fetch_response(
+            "textract", image_key(image_bytes),
+            lambda: self.textract.detect_document_text(Document={'Bytes': image_bytes})
+        )
+        log_timing(logger, "Textract API call took", int((time.time() - start_time) * 1000))
+        return "\n".join(b["Text"] for b in result["Blocks"] if b["BlockType"] == "LINE")
+
+
+class AWSFaceComparisonService(FaceComparisonService):
+    def __init__(self, config=None):
+        import boto3
+        self.rekognition = boto3.client('rekognition', config=config)
+
+    def compare_faces(self, source_image: bytes, target_image: bytes):
+        start_time = time.time()
+        response = fetch_response(
+            "rekognition", image_key(source_image, target_image),
+            lambda: self.rekognition.compare_faces(
+                SourceImage={'Bytes': source_image},
+                TargetImage={'Bytes': target_image},
+                SimilarityThreshold=REKOGNITION_THRESHOLD
+            )
+        )
+        log_timing(logger, "Rekognition API call took", int((time.time() - start_time) * 1000))
+        return response['FaceMatches'][0]['Similarity'] / 100.0 if response['FaceMatches'] else 0.0
+
+
+class CircuitBreakerTextExtractionService(TextExtractionService):
+    def __init__(self, service: TextExtractionService, breaker: CircuitBreaker):
+        self.service = service
+        self.breaker = breaker
+
+    def check(self):
+        self.breaker.check()
+
+    def extract_text_fields(self, image_bytes: bytes):
+        return self.breaker.call(self.service.extract_text_fields, image_bytes)
+
+
+class CircuitBreakerFaceComparisonService(FaceComparisonService):
+    def __init__(self, service: FaceComparisonService, breaker: CircuitBreaker):
+        self.service = service
+        self.breaker = breaker
+
+    def check(self):
+        self.breaker.check()
+
+    def compare_faces(self, source_image: bytes, target_image: bytes):
+        return self.breaker.call(self.service.compare_faces, source_image, target_image)
+
+
+# Error codes AWS returns when it is shedding load rather than rejecting the request
+THROTTLING_CODES = frozenset({
+    "Throttling", "ThrottlingException", "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded", "TooManyRequestsException", "SlowDown",
+})
+
+
+def is_dependency_failure(error):
+    # Only timeouts, connection failures, throttling and 5xx say the service is
+    # unhealthy. Client errors (an image with no face, an unsupported format) and
+    # replay misses are about the request, and must not open the breaker.
+    from botocore.exceptions import ClientError, ConnectionError, HTTPClientError
+    if isinstance(error, (ConnectionError, HTTPClientError, TimeoutError)):
+        return True
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code")
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        return code in THROTTLING_CODES or status >= 500
+    return False
+
+
+def aws_services():
+    # Breaker-wrapped Textract and Rekognition, as used by both entry points
+    from botocore.config import Config
+    config = Config(connect_timeout=AWS_CONNECT_TIMEOUT, read_timeout=AWS_READ_TIMEOUT, retries={"max_attempts": 2})
+    textract_breaker = CircuitBreaker("textract", is_failure=is_dependency_failure)
+    rekognition_breaker = CircuitBreaker("rekognition", is_failure=is_dependency_failure)
+    return (
+        CircuitBreakerTextExtractionService(AWSTextExtractionService(config), textract_breaker),
+        CircuitBreakerFaceComparisonService(AWSFaceComparisonService(config), rekognition_breaker)
+    )
@@ -0,0 +1,43 @@
+import logging
+from pdf2image import convert_from_bytes
+from io import BytesIO
+from core.config import TEXTRACT_DPI, TEXTRACT_JPEG_QUALITY, FACE_DPI, FACE_JPEG_QUALITY
+
+logger = logging.getLogger(__name__)
+
+def encode_jpeg(image, quality):
+    # Encode and free the decoded bitmap(s) right away instead of at request end
+    rgb = image if image.mode == "RGB" else image.convert("RGB")
+    buf = BytesIO()
+    rgb.save(buf, format="JPEG", quality=quality)
+    if rgb is not image:
+        rgb.close()
+    image.close()
+    return buf.getvalue()
+
+def render_page_jpeg(pdf_data, page, dpi=TEXTRACT_DPI, quality=TEXTRACT_JPEG_QUALITY):
+    images = convert_from_bytes(pdf_data, dpi=dpi, first_page=page, last_page=page)
+    return encode_jpeg(images.pop(), quality=quality)
+
+def prepare_images_sync(pdf_data, pages=(2, 3)):
+    try:
+        first, second = pages
+        if second == first + 1:
+            images = convert_from_bytes(pdf_data, dpi=FACE_DPI, first_page=first, last_page=second)
+        else:
+            images = [
+                image
+                for page in pages
+                for image in convert_from_bytes(pdf_data, dpi=FACE_DPI, first_page=page, last_page=page)
+            ]
+        if len(images) < 2:
+            return None, None
+
+        img2 = encode_jpeg(images[0], quality=FACE_JPEG_QUALITY)
+        img3 = encode_jpeg(images[1], quality=FACE_JPEG_QUALITY)
+        del images
+
+        return img2, img3
+    except Exception:
+        logger.exception("Image preparation error")
+        return None, None
@@ -0,0 +1,196 @@
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from core.config import RESPONSE_STORE_PATH, RESPONSE_STORE_MODE, RESPONSE_STORE_SEGMENT_BYTES
+
+# Record layout inside a segment: key length, payload length, key, zlib(JSON payload)
+HEADER = struct.Struct(">HI")
+INDEX_FILE = "index"
+
+logger = logging.getLogger(__name__)
+
+
+def image_key(*images):
+    digest = hashlib.sha256()
+    for image in images:
+        digest.update(hashlib.sha256(image).digest())
+    return digest.hexdigest()
+
+
+class ResponseStore:
+    # Append-only store of raw AWS responses. Records go to numbered segment files;
+    # the index file maps each key to (segment, offset, length) and is replayed at
+    # open, with the tail of the newest segment rescanned in case the index lags.
+    # One process writes at a time (flock on the store); others open it read-only,
+    # skip puts and pick up the writer's new index entries on a miss.
+
+    def __init__(self, path, segment_bytes=RESPONSE_STORE_SEGMENT_BYTES):
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._index = {}
+        self._readers = {}
+        self._index_offset = 0
+        self._warned_read_only = False
+        os.makedirs(path, exist_ok=True)
+
+        segments = sorted(int(n.split("-")[1].split(".")[0]) for n in os.listdir(path) if n.startswith("segment-"))
+        self._segment = segments[-1] if segments else 0
+        self._lock_file = open(os.path.join(path, "lock"), "a")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self.read_only = False
+        except BlockingIOError:
+            self.read_only = True
+
+        self._load_index()
+        self._writer = self._index_writer = None
+        if not self.read_only:
+            self._recover_tail()
+            self._writer = open(self._segment_path(self._segment), "ab")
+            self._index_writer = open(os.path.join(path, INDEX_FILE), "a")
+
+    def _segment_path(self, segment):
+        return os.path.join(self.path, f"segment-{segment:05d}.log")
+
+    def _load_index(self):
+        # Reads index lines appended since the last call; a trailing partial line is
+        # left for the next call
+        try:
+            with open(os.path.join(self.path, INDEX_FILE), "rb") as f:
+                f.seek(self._index_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].decode().splitlines():
+            parts = line.split()
+            if len(parts) == 4:
+                self._index[parts[0]] = (int(parts[1]), int(parts[2]), int(parts[3]))
+        self._index_offset += end
+
+    def _recover_tail(self):
+        segment_path = self._segment_path(self._segment)
+        if not os.path.exists(segment_path):
+            return
+        offset = max((o + l for s, o, l in self._index.values() if s == self._segment), default=0)
+        recovered = []
+        with open(segment_path, "r+b") as f:
+            f.seek(offset)
+            while True:
+                header = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    break
+                key_len, payload_len = HEADER.unpack(header)
+                key = f.read(key_len)
+                if len(key) < key_len or len(f.read(payload_len)) < payload_len:
+                    break
+                length = HEADER.size + key_len + payload_len
+                self._index[key.decode()] = (self._segment, offset, length)
+                recovered.append(key.decode())
+                offset += length
+            # Drop a record left half-written by a crash
+            f.truncate(offset)
+        if recovered:
+            with open(os.path.join(self.path, INDEX_FILE), "a") as f:
+                for key in recovered:
+                    f.write("%s %d %d %d\n" % ((key,) + self._index[key]))
+
+    def get(self, kind, key):
+        full_key = f"{kind}:{key}"
+        location = self._index.get(full_key)
+        if location is None and self.read_only:
+            with self._lock:
+                self._load_index()
+            location = self._index.get(full_key)
+        if location is None:
+            return None
+        segment, offset, length = location
+        with self._lock:
+            if self._writer is not None and segment == self._segment:
+                self._writer.flush()
+            reader = self._readers.get(segment)
+            if reader is None:
+                reader = self._readers[segment] = open(self._segment_path(segment), "rb")
+            record = os.pread(reader.fileno(), length, offset)
+        key_len, _ = HEADER.unpack_from(record)
+        return json.loads(zlib.decompress(record[HEADER.size + key_len:]))
+
+    def put(self, kind, key, response):
+        full_key = f"{kind}:{key}"
+        if self.read_only:
+            if not self._warned_read_only:
+                self._warned_read_only = True
+                logger.warning("Response store %s is locked by another process; responses are not recorded", self.path)
+            return
+        if full_key in self._index:
+            return
+        encoded_key = full_key.encode()
+        payload = zlib.compress(json.dumps(response, separators=(",", ":"), default=str).encode())
+        record = HEADER.pack(len(encoded_key), len(payload)) + encoded_key + payload
+
+        with self._lock:
+            if self._writer.tell() + len(record) > self.segment_bytes and self._writer.tell() > 0:
+                self._writer.close()
+                self._segment += 1
+                self._writer = open(self._segment_path(self._segment), "ab")
+            offset = self._writer.tell()
+            self._writer.write(record)
+            self._index[full_key] = (self._segment, offset, len(record))
+            self._index_writer.write(f"{full_key} {self._segment} {offset} {len(record)}\n")
+            self._writer.flush()
+            self._index_writer.flush()
+
+    def close(self):
+        with self._lock:
+            if not self.read_only:
+                self._writer.close()
+                self._index_writer.close()
+            self._lock_file.close()
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if not RESPONSE_STORE_PATH or RESPONSE_STORE_MODE == "off":
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResponseStore(RESPONSE_STORE_PATH)
+    return _store
+
+
+class ReplayMiss(Exception):
+    pass
+
+
+def fetch_response(kind, key, call):
+    # record: always call AWS and store the response
+    # cache:  serve stored responses, call AWS and store on a miss
+    # replay: serve stored responses only, never call AWS
+    store = get_store()
+    if store is None:
+        return call()
+
+    if RESPONSE_STORE_MODE in ("cache", "replay"):
+        response = store.get(kind, key)
+        if response is not None:
+            return response
+        if RESPONSE_STORE_MODE == "replay":
+            raise ReplayMiss(f"No stored {kind} response for {key}")
+
+    response = call()
+    store.put(kind, key, response)
+    return response
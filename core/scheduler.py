@@ -0,0 +1,143 @@
+import asyncio
+from core.config import FACE_SIMILARITY_THRESHOLD, SPECULATIVE_LAUNCH_MS
+from core.extraction import fields_complete
+from core.scoring import validate_fields
+from core.circuit_breaker import DependencyUnavailable
+from core.response_store import ReplayMiss
+
+def stage_results(page1, page2, page2_source, face, skipped, unavailable):
+    return {
+        "page1": page1,
+        "page2": page2,
+        "page2_source": page2_source,
+        "face": face,
+        "skipped": skipped,
+        "unavailable": unavailable
+    }
+
+
+async def run_eager(pipeline, document):
+    results = await asyncio.gather(
+        pipeline.run_stage_async("page1", document),
+        pipeline.run_in_executor(pipeline.run_page2, document),
+        pipeline.run_stage_async("face_match", document),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, ReplayMiss):
+            # A stored response is missing; scoring without it would be a false verdict
+            raise result
+    page1 = results[0] if not isinstance(results[0], Exception) else ({}, 0)
+    (page2_data, page2_source), page2_time = results[1] if not isinstance(results[1], Exception) else (({}, None), 0)
+    face = results[2] if not isinstance(results[2], Exception) else (None, 0)
+    unavailable = [r.dependency for r in results if isinstance(r, DependencyUnavailable)]
+    return stage_results(page1, (page2_data, page2_time), page2_source, face, [], unavailable)
+
+
+async def run_cost_aware(pipeline, document, speculative_ms=SPECULATIVE_LAUNCH_MS):
+    # Local stages run first; a remote stage is launched only while it can still
+    # change overall_pass. If local stages are still running after `speculative_ms`,
+    # the remote stages are started anyway and abandoned (not awaited) once moot;
+    # see Document.background.
+    template = document.template
+    remote_stages = ("page2_textract", "face_match")
+    running = {}
+    skipped = []
+    unavailable = []
+
+    def launch(stage):
+        if stage not in running:
+            running[stage] = asyncio.ensure_future(pipeline.run_stage_async(stage, document))
+
+    def skip(stage, reason):
+        if any(s["stage"] == stage for s in skipped):
+            return
+        task = running.pop(stage, None)
+        if task is not None:
+            document.abandoned.add(stage)
+            document.background.append(task)
+            # Nobody reads an abandoned stage's outcome; don't log its exception as unretrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        skipped.append({"stage": stage, "reason": reason, "cancelled": task is not None})
+
+    page1_task = asyncio.ensure_future(pipeline.run_stage_async("page1", document))
+    layer_task = asyncio.ensure_future(pipeline.run_stage_async("page2_text_layer", document))
+    timeout = None if speculative_ms is None else speculative_ms / 1000
+    _, pending = await asyncio.wait({page1_task, layer_task}, timeout=timeout)
+    if pending:
+        for stage in remote_stages:
+            launch(stage)
+        await asyncio.wait(pending)
+
+    page1_data, page1_time = page1_task.result()
+    layer_data, layer_time = layer_task.result()
+    page2 = ({}, 0)
+    page2_source = None
+    face = (None, 0)
+
+    if fields_complete(layer_data, template.field_patterns):
+        page2 = (layer_data, layer_time)
+        page2_source = "text_layer"
+        skip("page2_textract", "Page 2 text layer has every field")
+
+    missing = [f for f in template.fields if not page1_data.get(f)]
+    if missing:
+        reason = f"Page 1 is missing {', '.join(missing)}"
+        for stage in remote_stages:
+            skip(stage, reason)
+        return stage_results((page1_data, page1_time), page2, page2_source, face, skipped, unavailable)
+
+    if page2_source == "text_layer" and not validate_fields(page1_data, layer_data, template.fields)[1]:
+        skip("face_match", "Field mismatch already fails the document")
+
+    for stage in remote_stages:
+        if not any(s["stage"] == stage for s in skipped):
+            launch(stage)
+
+    while running:
+        done, _ = await asyncio.wait(set(running.values()), return_when=asyncio.FIRST_COMPLETED)
+        for stage, task in list(running.items()):
+            if task not in done or stage not in running:
+                continue
+            del running[stage]
+            error = task.exception()
+            if isinstance(error, ReplayMiss):
+                for other in list(running):
+                    skip(other, "Replay miss in " + stage)
+                raise error
+            if isinstance(error, DependencyUnavailable):
+                unavailable.append(error.dependency)
+            if stage == "page2_textract":
+                page2_source = "textract"
+                # A stage that raised produced no evidence; it cannot make the other moot
+                if error is not None:
+                    continue
+                page2 = task.result()
+                if running and not validate_fields(page1_data, page2[0], template.fields)[1]:
+                    skip("face_match", "Field mismatch already fails the document")
+            else:
+                if error is not None:
+                    continue
+                face = task.result()
+                similarity = face[0]
+                if running and similarity is not None and similarity < FACE_SIMILARITY_THRESHOLD:
+                    skip("page2_textract", "Face mismatch already fails the document")
+
+    return stage_results((page1_data, page1_time), page2, page2_source, face, skipped, unavailable)
+
+
+def run_sync(pipeline, document):
+    # Sequential counterpart of run_eager for callers without an event loop
+    unavailable = []
+    page1 = pipeline.run_stage("page1", document)
+    try:
+        (page2_data, page2_source), page2_time = pipeline.run_page2(document)
+    except DependencyUnavailable as e:
+        unavailable.append(e.dependency)
+        page2_data, page2_source, page2_time = {}, None, 0
+    try:
+        face = pipeline.run_stage("face_match", document)
+    except DependencyUnavailable as e:
+        unavailable.append(e.dependency)
+        face = (None, 0)
+    return stage_results(page1, (page2_data, page2_time), page2_source, face, [], unavailable)
@@ -0,0 +1,101 @@
+from difflib import SequenceMatcher
+from core.config import SIMILARITY_THRESHOLD, FACE_SIMILARITY_THRESHOLD
+
+def get_similarity_score(a, b):
+    if not a or not b:
+        return 0
+    return round(SequenceMatcher(None, a.strip(), b.strip()).ratio() * 100)
+
+def validate_fields(page1_data, page2_data, fields=("name", "father_name", "dob", "pan")):
+    field_scores = {}
+    field_pass = True
+    errors = []
+    
+    for f in fields:
+        score = get_similarity_score(page1_data.get(f), page2_data.get(f))
+        passed = score >= SIMILARITY_THRESHOLD
+        field_scores[f] = {
+            "score": score, 
+            "pass": passed,
+            "page1_value": page1_data.get(f),
+            "page2_value": page2_data.get(f)
+        }
+        if not passed:
+            field_pass = False
+            errors.append({
+                "code": f"{f.upper()}_MISMATCH",
+                "message": f"{f.replace('_', ' ').title()} differs between Page 1 and PAN card"
+            })
+    
+    return field_scores, field_pass, errors
+
+def validate_face_match(similarity):
+    if similarity is None:
+        return False, {
+            "code": "FACE_MATCH_ERROR",
+            "message": "Could not process face comparison"
+        }
+    
+    face_pass = similarity >= FACE_SIMILARITY_THRESHOLD
+    return face_pass, None
+
+def validate_dependencies(unavailable):
+    return [
+        {
+            "code": "DEPENDENCY_UNAVAILABLE",
+            "message": f"{dependency} is unavailable",
+            "dependency": dependency
+        }
+        for dependency in unavailable
+    ]
+
+def overall_verdict(*passes):
+    # Any failing check decides the verdict; a check skipped for an unavailable
+    # dependency (None) otherwise leaves it undecided
+    if any(p is False for p in passes):
+        return False
+    if any(p is None for p in passes):
+        return None
+    return True
+
+def score_document(page1_data, page2_data, similarity, template, unavailable=(), skipped=()):
+    face_skipped = any(s["stage"] == "face_match" for s in skipped)
+    # Textract skipped without a text-layer result: the card's fields were never read,
+    # so only fields missing from page 1 (which fail whatever the card says) are scored
+    fields_skipped = any(s["stage"] == "page2_textract" for s in skipped) and not page2_data
+    if fields_skipped:
+        missing = [f for f in template.fields if not page1_data.get(f)]
+        field_scores, field_pass, errors = validate_fields(page1_data, page2_data, missing)
+        field_pass = False if missing else None
+    else:
+        field_scores, field_pass, errors = validate_fields(page1_data, page2_data, template.fields)
+    face_pass, face_error = validate_face_match(similarity)
+    # Checks whose AWS dependency is unavailable are reported as undecided
+    if "textract" in unavailable:
+        field_pass, errors = None, []
+    if "rekognition" in unavailable:
+        face_pass, face_error = None, None
+    if face_error and not face_skipped:
+        errors.append(face_error)
+    errors.extend(validate_dependencies(unavailable))
+    return {
+        "template": template.name,
+        "field_matches": field_scores,
+        "field_pass": field_pass,
+        "face_match": {
+            "similarity": round(similarity, 2) if similarity is not None else None,
+            "pass": face_pass,
+            "skipped": face_skipped
+        },
+        "overall_pass": overall_verdict(field_pass, face_pass),
+        "errors": errors
+    }
+
+def score_stages(stages, template):
+    result = score_document(
+        stages["page1"][0], stages["page2"][0], stages["face"][0], template,
+        stages["unavailable"], stages["skipped"]
+    )
+    result["page2_source"] = stages["page2_source"]
+    result["skipped_stages"] = stages["skipped"]
+    return result
@@ -0,0 +1,122 @@
+from io import BytesIO
+from pypdf import PdfReader
+from core.extraction import DATE_PATTERN, extract_fields_page1, extract_fields_page2
+
+# Page sizes in PDF points, matched within SIZE_TOLERANCE in either orientation
+PAGE_SIZES = {
+    "A4": (595, 842),
+    "LETTER": (612, 792),
+}
+SIZE_TOLERANCE = 6
+
+
+def normalize_text(text):
+    # Text layers space words unevenly ("PAN  NUMBER"); compare single-spaced upper case
+    return " ".join(text.upper().split())
+
+
+class DocumentTemplate:
+    def __init__(self, name, page_count, anchors, roles, form_extractor, id_extractor,
+                 field_patterns, page_size=None):
+        self.name = name
+        self.page_count = page_count
+        # Page-1 text that identifies the layout; compared case- and whitespace-insensitively
+        self.anchors = frozenset(normalize_text(a) for a in anchors)
+        # 1-based page number of the "form", "id_card" and "selfie" pages
+        self.roles = roles
+        self.form_extractor = form_extractor
+        self.id_extractor = id_extractor
+        # Fields compared across pages, with the shape a well-formed value must have
+        self.field_patterns = field_patterns
+        self.page_size = page_size
+
+    @property
+    def fields(self):
+        return list(self.field_patterns)
+
+    @property
+    def image_pages(self):
+        return self.roles["id_card"], self.roles["selfie"]
+
+    def fingerprint(self):
+        return self.page_count, self.anchors, self.page_size
+
+    def matches(self, page_count, text, size):
+        # Other templates' anchors may also appear on page 1; only this template's must
+        return (
+            page_count == self.page_count
+            and self.page_size in (None, size)
+            and all(anchor in text for anchor in self.anchors)
+        )
+
+    def specificity(self):
+        return len(self.anchors), self.page_size is not None
+
+
+PAN_APPLICATION_V1 = DocumentTemplate(
+    name="pan_application_v1",
+    page_count=3,
+    anchors=["PAN NUMBER", "FULL NAME"],
+    roles={"form": 1, "id_card": 2, "selfie": 3},
+    form_extractor=extract_fields_page1,
+    id_extractor=extract_fields_page2,
+    field_patterns={
+        "name": r"[A-Z ]+",
+        "father_name": r"[A-Z ]+",
+        "dob": DATE_PATTERN,
+        "pan": r"[A-Z]{5}[0-9]{4}[A-Z]",
+    },
+)
+
+_templates = {}
+
+
+def register_template(template):
+    key = template.fingerprint()
+    if key in _templates:
+        raise ValueError(f"Template {template.name} has the same fingerprint as {_templates[key].name}")
+    _templates[key] = template
+
+
+register_template(PAN_APPLICATION_V1)
+
+
+def get_template(name):
+    return next((t for t in _templates.values() if t.name == name), None)
+
+
+def page_size_class(page):
+    width, height = sorted((float(page.mediabox.width), float(page.mediabox.height)))
+    for name, (w, h) in PAGE_SIZES.items():
+        if abs(width - w) <= SIZE_TOLERANCE and abs(height - h) <= SIZE_TOLERANCE:
+            return name
+    return None
+
+
+def fingerprint_pdf(reader):
+    # Page count, raw page-1 text and page-1 size class
+    first_page = reader.pages[0]
+    return len(reader.pages), first_page.extract_text() or "", page_size_class(first_page)
+
+
+def match_template(pdf_data):
+    # Reads only the page count, page-1 text and page-1 size; nothing is rendered.
+    # Parses the PDF, so async callers should run it on an executor. Returns the
+    # page-1 text as well so the page1 stage need not extract it again.
+    try:
+        reader = PdfReader(BytesIO(pdf_data))
+        page_count, text, size = fingerprint_pdf(reader)
+    except Exception:
+        return None, None, "Invalid PDF file"
+
+    # The template whose anchors and page size pin the layout down most wins
+    normalized = normalize_text(text)
+    candidates = [t for t in _templates.values() if t.matches(page_count, normalized, size)]
+    if not candidates:
+        return None, text, "Unrecognized document layout"
+    return max(candidates, key=DocumentTemplate.specificity), text, None
+
+
+def identify_template(pdf_data):
+    template, _, error = match_template(pdf_data)
+    return template, error
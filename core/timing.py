@@ -0,0 +1,9 @@
+import random
+from core.config import LOG_TIMING_SAMPLE_RATE
+
+
+def log_timing(logger, message, duration_ms, **fields):
+    # Sample before a LogRecord is built so dropped lines cost almost nothing
+    if LOG_TIMING_SAMPLE_RATE < 1 and random.random() >= LOG_TIMING_SAMPLE_RATE:
+        return
+    logger.info(message, extra={"duration_ms": duration_ms, **fields})
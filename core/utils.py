@@ -0,0 +1,8 @@
+import uuid
+import time
+
+def generate_application_id():
+    return f"APP-{uuid.uuid4().hex[:8].upper()}"
+
+def get_current_timestamp():
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
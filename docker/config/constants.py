@@ -1,8 +0,0 @@
-SIMILARITY_THRESHOLD = 80
-FACE_SIMILARITY_THRESHOLD = 0.7
-REKOGNITION_THRESHOLD = 70
-PDF_DPI = 150
-IMAGE_QUALITY = 75
-PAGES_REQUIRED = 3
-MAX_PDF_SIZE = 10
-MAX_WORKERS = 4
\ No newline at end of file
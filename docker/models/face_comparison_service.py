@@ -1,6 +0,0 @@
-from abc import ABC, abstractmethod
-
-class FaceComparisonService(ABC):
-    @abstractmethod
-    def compare_faces(self, source_image: bytes, target_image: bytes):
-        pass
\ No newline at end of file
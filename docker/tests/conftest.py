@@ -0,0 +1,9 @@
+import os
+import sys
+
+# In the Lambda image core/ sits next to main.py; in the repository it is one level up.
+# Appended so docker/main.py still wins over the Quart service's main.py.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+# Importing either entry point builds the boto clients
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
@@ -0,0 +1,92 @@
+import asyncio
+import base64
+import json
+import pytest
+from unittest.mock import patch
+from core.adapters import ApiGatewayAdapter, InvalidDocument, parse_pdf, sanity_check
+from tests.test_handler import encode_multipart
+
+def test_valid_pdf_signature_and_mime(monkeypatch):
+    valid_pdf = b'%PDF-1.4 rest of pdf data here'
+
+    # Monkeypatch magic to return correct MIME
+    monkeypatch.setattr("magic.from_buffer", lambda x, mime=True: "application/pdf")
+    
+    assert sanity_check(valid_pdf) is True
+
+def test_invalid_pdf_signature(monkeypatch):
+    invalid_pdf = b'NOTPDF rest of data'
+
+    # Monkeypatch magic to return correct MIME anyway
+    monkeypatch.setattr("magic.from_buffer", lambda x, mime=True: "application/pdf")
+
+    assert sanity_check(invalid_pdf) is False
+
+def test_invalid_pdf_mime(monkeypatch):
+    valid_pdf = b'%PDF-1.4 some content'
+
+    # Monkeypatch magic to return a wrong MIME type
+    monkeypatch.setattr("magic.from_buffer", lambda x, mime=True: "text/plain")
+
+    assert sanity_check(valid_pdf) is False
+
+def test_completely_invalid_file(monkeypatch):
+    garbage = b'abcdefg12345'
+
+    # Monkeypatch to simulate wrong MIME type
+    monkeypatch.setattr("magic.from_buffer", lambda x, mime=True: "image/png")
+
+    assert sanity_check(garbage) is False
+
+
+def multipart_event(body, content_type):
+    return {
+        "httpMethod": "POST",
+        "headers": {"content-type": content_type},
+        "body": base64.b64encode(body).decode("utf-8"),
+        "isBase64Encoded": True
+    }
+
+@patch("core.adapters.sanity_check", return_value=True)
+def test_parse_pdf_success(mock_sanity):
+    payload = b"%PDF-1.4 dummy content\r\n\x00\xff binary\r\n"
+    result = parse_pdf(multipart_event(*encode_multipart(payload)))
+    assert result == payload
+    mock_sanity.assert_called_once_with(payload)
+
+def test_parse_pdf_missing_file():
+    body, content_type = encode_multipart(b"%PDF-1.4")
+    event = multipart_event(body.replace(b'name="file"', b'name="upload"'), content_type)
+    with pytest.raises(Exception, match="Missing 'file' field in form"):
+        parse_pdf(event)
+
+def test_parse_pdf_not_multipart():
+    event = multipart_event(b"%PDF-1.4", "application/pdf")
+    with pytest.raises(Exception, match="Missing 'file' field in form"):
+        parse_pdf(event)
+
+@patch("core.adapters.sanity_check", return_value=False)
+def test_parse_pdf_invalid_file_type(mock_sanity):
+    with pytest.raises(Exception, match="Invalid file type"):
+        parse_pdf(multipart_event(*encode_multipart(b"Not a PDF")))
+
+def test_parse_pdf_invalid_method():
+    event = {"httpMethod": "GET", "headers": {}, "body": "", "isBase64Encoded": False}
+    with pytest.raises(Exception, match="Only POST method Supported"):
+        parse_pdf(event)
+
+def test_api_gateway_adapter_rejects_invalid_upload():
+    event = {"httpMethod": "GET", "headers": {}, "body": "", "isBase64Encoded": False}
+    adapter = ApiGatewayAdapter(event)
+    with pytest.raises(InvalidDocument, match="Invalid PDF: Only POST method Supported"):
+        asyncio.run(adapter.read_document())
+
+def test_api_gateway_adapter_query_and_respond():
+    adapter = ApiGatewayAdapter({"queryStringParameters": {"scheduling": "cost_aware"}})
+    assert adapter.query("scheduling", "eager") == "cost_aware"
+    assert ApiGatewayAdapter({}).query("scheduling", "eager") == "eager"
+
+    response = adapter.respond(503, {"error": "busy"}, {"Retry-After": "5"})
+    assert response["statusCode"] == 503
+    assert json.loads(response["body"]) == {"error": "busy"}
+    assert response["headers"] == {"Retry-After": "5"}
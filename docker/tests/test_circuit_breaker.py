@@ -0,0 +1,129 @@
+import pytest
+from unittest.mock import MagicMock
+from botocore.exceptions import ClientError, EndpointConnectionError, ReadTimeoutError
+from core.circuit_breaker import CircuitBreaker, DependencyUnavailable, CLOSED, OPEN, HALF_OPEN
+from core.providers import CircuitBreakerTextExtractionService, is_dependency_failure
+from core.response_store import ReplayMiss
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def failing():
+    raise RuntimeError("boom")
+
+def make_breaker(clock):
+    return CircuitBreaker("textract", failure_rate=0.5, min_calls=4, window=4,
+                          slow_call_ms=1000, open_seconds=30, clock=clock)
+
+def test_breaker_stays_closed_below_failure_rate():
+    breaker = make_breaker(FakeClock())
+    for _ in range(3):
+        breaker.call(lambda: "ok")
+    with pytest.raises(RuntimeError):
+        breaker.call(failing)
+    assert breaker.state == CLOSED
+
+def test_breaker_opens_on_error_rate_and_short_circuits():
+    breaker = make_breaker(FakeClock())
+    for _ in range(2):
+        breaker.call(lambda: "ok")
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            breaker.call(failing)
+    assert breaker.state == OPEN
+
+    func = MagicMock()
+    with pytest.raises(DependencyUnavailable) as exc:
+        breaker.call(func)
+    assert exc.value.dependency == "textract"
+    func.assert_not_called()
+
+def test_breaker_counts_slow_calls_as_failures():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    def slow():
+        clock.now += 2
+        return "ok"
+
+    for _ in range(4):
+        breaker.call(slow)
+    assert breaker.state == OPEN
+
+def test_half_open_probe_closes_on_success():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            breaker.call(failing)
+
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+def test_half_open_probe_reopens_on_failure():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            breaker.call(failing)
+
+    clock.now += 30
+    with pytest.raises(RuntimeError):
+        breaker.call(failing)
+    assert breaker.state == OPEN
+    with pytest.raises(DependencyUnavailable):
+        breaker.check()
+
+def test_text_extraction_service_wrapper():
+    service = MagicMock()
+    service.extract_text_fields.return_value = "text"
+    wrapped = CircuitBreakerTextExtractionService(service, make_breaker(FakeClock()))
+
+    assert wrapped.extract_text_fields(b"image") == "text"
+    service.extract_text_fields.assert_called_once_with(b"image")
+
+def test_breaker_ignores_errors_that_are_not_dependency_failures():
+    clock = FakeClock()
+    breaker = CircuitBreaker("textract", failure_rate=0.5, min_calls=4, window=4, slow_call_ms=1000,
+                             open_seconds=30, clock=clock, is_failure=lambda e: not isinstance(e, ReplayMiss))
+
+    def miss():
+        raise ReplayMiss("no stored response")
+
+    for _ in range(8):
+        with pytest.raises(ReplayMiss):
+            breaker.call(miss)
+    assert breaker.state == CLOSED
+
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            breaker.call(failing)
+    clock.now += 30
+    # An ignored error during the half-open probe leaves the breaker half-open for the next probe
+    with pytest.raises(ReplayMiss):
+        breaker.call(miss)
+    assert breaker.state == HALF_OPEN
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+def client_error(code, status):
+    return ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, "CompareFaces")
+
+@pytest.mark.parametrize("error, failure", [
+    (ReadTimeoutError(endpoint_url="https://textract"), True),
+    (EndpointConnectionError(endpoint_url="https://textract"), True),
+    (client_error("ThrottlingException", 400), True),
+    (client_error("InternalServerError", 500), True),
+    (client_error("InvalidParameterException", 400), False),
+    (client_error("InvalidImageFormatException", 400), False),
+    (ReplayMiss("no stored response"), False),
+    (KeyError("FaceMatches"), False),
+])
+def test_only_timeouts_throttling_and_server_errors_are_dependency_failures(error, failure):
+    assert is_dependency_failure(error) is failure
@@ -1,7 +1,8 @@
-from src.extraction_helpers import (
+from core.extraction import (
     extract_after_label,
-    extract_fields_from_form,
-    extract_fields_from_pan
+    extract_fields_page1,
+    extract_fields_page2,
+    fields_complete
 )
 
 
@@ -17,35 +18,51 @@ def test_extract_after_label_not_found():
     result = extract_after_label(text, r"FULL NAME\s*", r"[A-Z ]+")
     assert result is None
 
-def test_extract_fields_from_form_full():
+def test_extract_fields_page1_full():
     text = """PAN NUMBER ABCDE1234F
               FULL NAME JOHN DOE
               DATE OF BIRTH 12/03/1990
               FATHER NAME MICHAEL DOE"""
-    fields = extract_fields_from_form(text)
+    fields = extract_fields_page1(text)
     assert fields["pan"] == "ABCDE1234F"
     assert fields["name"] == "JOHN DOE"
     assert fields["dob"] == "12/03/1990"
     assert fields["father_name"] == "MICHAEL DOE"
 
 
-def test_extract_fields_from_pan_all_fields():
+def test_extract_fields_page2_all_fields():
     text = """Permanent Account Number Card
               ABCDE1234F
               Name: JANE DOE
               Father's Name: JOHN DOE
               Date of Birth
               01/01/1980"""
-    fields = extract_fields_from_pan(text)
+    fields = extract_fields_page2(text)
     assert fields["pan"] == "ABCDE1234F"
     assert fields["name"] == "JANE DOE"
     assert fields["father_name"] == "JOHN DOE"
     assert fields["dob"] == "01/01/1980"
 
-def test_extract_fields_from_pan_missing_fields():
+def test_extract_fields_page2_missing_fields():
     text = "Permanent Account Number Card ABCDE1234F"
-    fields = extract_fields_from_pan(text)
+    fields = extract_fields_page2(text)
     assert fields["pan"] == "ABCDE1234F"
     assert fields["name"] is None
     assert fields["father_name"] is None
     assert fields["dob"] is None
+
+def test_extract_fields_page2_unlabeled_dob():
+    text = """Permanent Account Number Card
+              ABCDE1234F
+              Name: JANE DOE
+              1/1/1980"""
+    fields = extract_fields_page2(text)
+    assert fields["dob"] == "1/1/1980"
+
+def test_fields_complete_all_fields():
+    fields = {"pan": "ABCDE1234F", "name": "JANE DOE", "father_name": "JOHN DOE", "dob": "01/01/1980"}
+    assert fields_complete(fields) is True
+
+def test_fields_complete_missing_or_malformed():
+    assert fields_complete({"pan": "ABCDE1234F", "name": "JANE DOE", "father_name": None, "dob": "01/01/1980"}) is False
+    assert fields_complete({"pan": "ABCDE1234", "name": "JANE DOE", "father_name": "JOHN DOE", "dob": "01/01/1980"}) is False
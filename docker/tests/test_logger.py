@@ -0,0 +1,114 @@
+import asyncio
+import json
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from core import timing
+from services import logger as log
+from core.pipeline import Pipeline
+from tests.test_pipeline import FakeTextService, FakeFaceService
+
+def make_logger(name):
+    # The same wiring as configure_logging, on a private logger and stream
+    log_queue = queue.SimpleQueue()
+    handler = log.RecordQueueHandler(log_queue)
+    handler.addFilter(log.ContextFilter())
+    logger = logging.getLogger(name)
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    stream = StringIO()
+    writer = log.BatchWriter(log_queue, stream, log.JsonFormatter())
+    return logger, writer, stream
+
+def lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+def test_request_id_reaches_executor_threads():
+    logger, writer, stream = make_logger("tests.context")
+    writer.start()
+    pipeline = Pipeline(FakeTextService(), FakeFaceService(), ThreadPoolExecutor(max_workers=2))
+
+    async def handle(request):
+        log.request_id.set(request)
+        await pipeline.run_in_executor(logger.info, "in executor")
+        logger.info("on loop")
+
+    async def main():
+        await asyncio.gather(handle("req-1"), handle("req-2"))
+
+    asyncio.run(main())
+    writer.stop()
+    assert not writer.is_alive()
+    seen = {(entry["msg"], entry["request_id"]) for entry in lines(stream)}
+    assert seen == {(msg, req) for msg in ("in executor", "on loop") for req in ("req-1", "req-2")}
+
+def test_writer_drains_records_queued_before_stop():
+    logger, writer, stream = make_logger("tests.drain")
+    for i in range(5):
+        logger.info("line %d", i, extra={"n": i})
+    writer.start()
+    writer.stop()
+    assert [entry["n"] for entry in lines(stream)] == list(range(5))
+    assert lines(stream)[0]["msg"] == "line 0"
+
+def test_log_timing_sampling(monkeypatch, caplog):
+    logger = logging.getLogger("tests.sampling")
+    draws = iter([0.1, 0.7, 0.4, 0.9])
+    monkeypatch.setattr(timing, "LOG_TIMING_SAMPLE_RATE", 0.5)
+    monkeypatch.setattr(timing.random, "random", lambda: next(draws))
+
+    with caplog.at_level(logging.INFO, logger="tests.sampling"):
+        for stage in ("a", "b", "c", "d"):
+            timing.log_timing(logger, "Stage completed", 12, stage=stage)
+    assert [(r.stage, r.duration_ms) for r in caplog.records] == [("a", 12), ("c", 12)]
+
+def test_log_timing_unsampled_by_default(monkeypatch, caplog):
+    monkeypatch.setattr(timing, "LOG_TIMING_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(timing.random, "random", lambda: 1 / 0)
+    with caplog.at_level(logging.INFO, logger="tests.sampling"):
+        timing.log_timing(logging.getLogger("tests.sampling"), "Validation completed", 5)
+    assert len(caplog.records) == 1
+
+class BrokenStream(StringIO):
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def write(self, text):
+        if self.failures:
+            self.failures -= 1
+            raise BrokenPipeError(32, "Broken pipe")
+        return super().write(text)
+
+def test_writer_survives_stream_errors(monkeypatch, capsys):
+    monkeypatch.setattr(log, "LOG_BATCH_SIZE", 1)
+    logger, writer, _ = make_logger("tests.broken")
+    stream = writer.stream = BrokenStream(failures=2)
+    for i in range(3):
+        logger.info("line %d", i)
+    writer.start()
+    writer.stop()
+    assert not writer.is_alive()
+    assert writer.write_errors == 2
+    assert [entry["msg"] for entry in lines(stream)] == ["line 2"]
+    assert capsys.readouterr().err.count("BrokenPipeError") == 1
+
+def test_full_queue_drops_and_counts_records():
+    log_queue = queue.Queue(2)
+    handler = log.RecordQueueHandler(log_queue)
+    logger = logging.getLogger("tests.bounded")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    for i in range(5):
+        logger.info("line %d", i)
+    assert handler.dropped == 3
+
+    stream = StringIO()
+    writer = log.BatchWriter(log_queue, stream, log.JsonFormatter())
+    writer.start()
+    writer.stop()
+    assert [entry["msg"] for entry in lines(stream)] == ["line 0", "line 1"]
@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+from services.memory_budget import MemoryBudget, MemoryBudgetExceeded
+
+def test_acquire_waits_for_release():
+    async def main():
+        budget = MemoryBudget(100)
+        assert await budget.acquire(60) == 60
+        second = asyncio.ensure_future(budget.acquire(60, timeout=1))
+        await asyncio.sleep(0.01)
+        assert not second.done() and budget.stats()["waiting_requests"] == 1
+        await budget.release(60)
+        assert await second == 60
+        return budget.stats()
+
+    stats = asyncio.run(main())
+    assert stats == {"budget_bytes": 100, "live_bytes": 60, "peak_bytes": 60, "waiting_requests": 0}
+
+def test_acquire_times_out():
+    async def main():
+        budget = MemoryBudget(100)
+        await budget.acquire(80)
+        with pytest.raises(MemoryBudgetExceeded):
+            await budget.acquire(40, timeout=0.01)
+        return budget.stats()
+
+    stats = asyncio.run(main())
+    assert stats["live_bytes"] == 80 and stats["waiting_requests"] == 0
+
+def test_oversized_request_is_clamped_to_capacity():
+    async def main():
+        budget = MemoryBudget(100)
+        async with budget.reserve(500) as reservation:
+            assert reservation.reserved == 100
+            assert budget.in_use == 100
+        return budget.in_use
+
+    assert asyncio.run(main()) == 0
+
+def test_reservation_held_until_background_work_finishes():
+    async def main():
+        budget = MemoryBudget(100)
+        work = asyncio.Event()
+        background = asyncio.ensure_future(work.wait())
+        async with budget.reserve(70) as reservation:
+            reservation.hold_until([background])
+        await asyncio.sleep(0)
+        held = budget.in_use
+        work.set()
+        await asyncio.sleep(0.01)
+        return held, budget.in_use
+
+    assert asyncio.run(main()) == (70, 0)
@@ -0,0 +1,189 @@
+import asyncio
+import base64
+import importlib.util
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+import pytest
+
+# Both entry points are exercised, so the Quart service's dependencies are needed too;
+# see tests/requirements.txt. libmagic and poppler are stood in for when missing.
+pytest.importorskip("quart")
+
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+from core.hooks import StageTimings
+from core.pipeline import Pipeline
+from core.providers import TextExtractionService, FaceComparisonService
+from tests.test_handler import encode_multipart
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+# Directory of PDFs to compare on; a small synthetic corpus is used when unset
+CORPUS = os.getenv("BENCHMARK_CORPUS")
+RUNS = 3
+# Stand-in for the AWS round trip so stage timings are dominated by comparable work
+FAKE_LATENCY_SECONDS = 0.02
+# Everything except ids, timestamps, metrics and the Quart-only screening block
+PARITY_FIELDS = (
+    "template", "field_matches", "field_pass", "page2_source",
+    "face_match", "overall_pass", "skipped_stages"
+)
+SCREENING_CODES = {"DUPLICATE_PAN", "WATCHLIST_MATCH"}
+
+FORM_LINES = ["PAN NUMBER ABCDE1234F", "FULL NAME JANE DOE", "DATE OF BIRTH 01/01/1980", "FATHER NAME JOHN DOE"]
+CARD_LINES = [
+    "Permanent Account Number Card ABCDE1234F", "Name: JANE DOE",
+    "Father's Name: JOHN DOE", "Date of Birth 01/01/1980"
+]
+
+class FakeTextService(TextExtractionService):
+    def extract_text_fields(self, image_bytes):
+        time.sleep(FAKE_LATENCY_SECONDS)
+        return "\n".join(CARD_LINES)
+
+class FakeFaceService(FaceComparisonService):
+    def compare_faces(self, source_image, target_image):
+        # Slower than OCR so cost-aware scheduling cancels stages in the same order every run
+        time.sleep(2 * FAKE_LATENCY_SECONDS)
+        return 0.93
+
+def make_pdf(pages):
+    # Minimal A4 PDF; each page is a list of text lines (empty: no text layer)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"
+    ]
+    kids = []
+    for lines in pages:
+        stream = "BT /F1 14 Tf 16 TL 50 780 Td " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+def load_corpus():
+    if CORPUS:
+        return [(path.name, path.read_bytes()) for path in sorted(Path(CORPUS).glob("*.pdf"))]
+    return [
+        ("digital", make_pdf([FORM_LINES, CARD_LINES, []])),
+        ("scanned", make_pdf([FORM_LINES, [], []])),
+        ("mismatch", make_pdf([[line.replace("JANE", "MARY") for line in FORM_LINES], CARD_LINES, []])),
+        ("unrecognized", make_pdf([["SOMETHING ELSE"], [], []])),
+    ]
+
+def load_quart_main():
+    # Both entry points are called main.py; load the Quart one under another name
+    spec = importlib.util.spec_from_file_location("quart_main", REPO_ROOT / "main.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def make_pipeline():
+    timings = StageTimings()
+    return Pipeline(FakeTextService(), FakeFaceService(), ThreadPoolExecutor(max_workers=4), timings), timings
+
+def fake_convert_from_bytes(pdf_data, dpi=200, first_page=1, last_page=1):
+    # One blank A4 page per requested page, for machines without poppler
+    size = (595 * dpi // 72, 842 * dpi // 72)
+    return [Image.new("RGB", size, "white") for _ in range(first_page, last_page + 1)]
+
+@pytest.fixture(autouse=True)
+def local_stand_ins(monkeypatch):
+    # libmagic is only in the Lambda image; the %PDF- prefix check still runs
+    monkeypatch.setattr("core.adapters.sanity_check", lambda file_bytes: file_bytes.startswith(b"%PDF-"))
+    if shutil.which("pdftoppm") is None:
+        monkeypatch.setattr("core.rendering.convert_from_bytes", fake_convert_from_bytes)
+
+@pytest.fixture(scope="module")
+def entry_points():
+    import main as lambda_main
+    quart_main = load_quart_main()
+    return lambda_main, quart_main
+
+def call_lambda(lambda_main, pdf_data, mode):
+    body, content_type = encode_multipart(pdf_data)
+    event = {
+        "httpMethod": "POST",
+        "headers": {"Content-Type": content_type},
+        "queryStringParameters": {"scheduling": mode},
+        "body": base64.b64encode(body).decode(),
+        "isBase64Encoded": True
+    }
+    response = lambda_main.handler(event, None)
+    return response["statusCode"], json.loads(response["body"])
+
+def call_quart(quart_main, pdf_data, mode):
+    async def post():
+        client = quart_main.app.test_client()
+        response = await client.post(
+            "/validate",
+            query_string={"scheduling": mode},
+            files={"file": FileStorage(BytesIO(pdf_data), filename="document.pdf", content_type="application/pdf")}
+        )
+        return response.status_code, await response.get_json()
+    return asyncio.run(post())
+
+def comparable(status, body):
+    if status != 200:
+        return status, body
+    result = {field: body[field] for field in PARITY_FIELDS}
+    result["errors"] = [e for e in body["errors"] if e["code"] not in SCREENING_CODES]
+    return status, result
+
+@pytest.mark.parametrize("mode", ["eager", "cost_aware"])
+def test_entry_points_agree(entry_points, monkeypatch, mode):
+    lambda_main, quart_main = entry_points
+    lambda_pipeline, lambda_timings = make_pipeline()
+    quart_pipeline, quart_timings = make_pipeline()
+    monkeypatch.setattr(lambda_main, "pipeline", lambda_pipeline)
+    monkeypatch.setattr(quart_main, "pipeline", quart_pipeline)
+    monkeypatch.setattr(quart_main, "record_application", lambda pan, application_id: None)
+
+    for name, pdf_data in load_corpus():
+        for _ in range(RUNS):
+            lambda_result = comparable(*call_lambda(lambda_main, pdf_data, mode))
+            quart_result = comparable(*call_quart(quart_main, pdf_data, mode))
+            assert lambda_result == quart_result, name
+
+    lambda_stats = lambda_timings.stats()
+    quart_stats = quart_timings.stats()
+    assert lambda_stats.keys() == quart_stats.keys()
+    for stage, stats in lambda_stats.items():
+        assert stats["count"] == quart_stats[stage]["count"], stage
+        # Same code on the same inputs: per-stage means should be close
+        tolerance = max(25, 0.5 * max(stats["mean_ms"], quart_stats[stage]["mean_ms"]))
+        assert abs(stats["mean_ms"] - quart_stats[stage]["mean_ms"]) <= tolerance, stage
+
+def test_synthetic_corpus_verdicts(entry_points, monkeypatch):
+    if CORPUS:
+        pytest.skip("verdicts are only known for the synthetic corpus")
+    lambda_main, _ = entry_points
+    pipeline, _ = make_pipeline()
+    monkeypatch.setattr(lambda_main, "pipeline", pipeline)
+
+    results = {name: call_lambda(lambda_main, pdf_data, "eager") for name, pdf_data in load_corpus()}
+    assert results["digital"][1]["page2_source"] == "text_layer"
+    assert results["digital"][1]["overall_pass"] is True
+    assert results["scanned"][1]["page2_source"] == "textract"
+    assert results["scanned"][1]["overall_pass"] is True
+    assert results["mismatch"][1]["overall_pass"] is False
+    assert results["unrecognized"] == (400, {"error": "Unrecognized document layout"})
@@ -0,0 +1,280 @@
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock
+from core.circuit_breaker import DependencyUnavailable
+from core.hooks import StageCache, StageTimings, HookChain
+from core.pipeline import Pipeline, Document, identify_document
+from core.providers import TextExtractionService, FaceComparisonService
+from core.response_store import ReplayMiss
+from core.scoring import score_stages
+from core.rendering import prepare_images_sync
+from core import templates
+from core.templates import PAN_APPLICATION_V1, DocumentTemplate, identify_template, register_template
+
+PDF_DUMMY = b"%PDF-1.4 dummy data for testing"
+FORM_TEXT = "PAN NUMBER ABCDE1234F\nFULL NAME JANE DOE\nDATE OF BIRTH 01/01/1980\nFATHER NAME JOHN DOE"
+CARD_TEXT = (
+    "Permanent Account Number Card ABCDE1234F\n"
+    "Name: JANE DOE\nFather's Name: JOHN DOE\nDate of Birth 01/01/1980"
+)
+FIELDS = {"pan": "ABCDE1234F", "name": "JANE DOE", "father_name": "JOHN DOE", "dob": "01/01/1980"}
+
+class FakeTextService(TextExtractionService):
+    def __init__(self, text=CARD_TEXT):
+        self.text = text
+        self.calls = []
+
+    def extract_text_fields(self, image_bytes):
+        self.calls.append(image_bytes)
+        return self.text
+
+class FakeFaceService(FaceComparisonService):
+    def __init__(self, similarity=0.93):
+        self.similarity = similarity
+        self.calls = []
+
+    def compare_faces(self, source_image, target_image):
+        self.calls.append((source_image, target_image))
+        return self.similarity
+
+class UnavailableFaceService(FakeFaceService):
+    def check(self):
+        raise DependencyUnavailable("rekognition")
+
+class UnavailableTextService(FakeTextService):
+    def check(self):
+        raise DependencyUnavailable("textract")
+
+class ReplayMissTextService(FakeTextService):
+    def extract_text_fields(self, image_bytes):
+        raise ReplayMiss("No stored textract response")
+
+def mock_pages(*texts):
+    pages = []
+    for text in texts:
+        page = MagicMock()
+        page.extract_text.return_value = text
+        pages.append(page)
+    return pages
+
+def mock_image():
+    image = MagicMock()
+    image.mode = "RGB"
+    image.save.side_effect = lambda buf, **kwargs: buf.write(b"\xff\xd8\xff")
+    return image
+
+@pytest.fixture
+def document():
+    return Document(PDF_DUMMY, PAN_APPLICATION_V1)
+
+@patch("core.extraction.PdfReader")
+def test_page1_stage(mock_reader, document):
+    mock_reader.return_value.pages = mock_pages(FORM_TEXT, "", "")
+    pipeline = Pipeline(FakeTextService(), FakeFaceService())
+
+    result, _ = pipeline.run_stage("page1", document)
+    assert result == FIELDS
+
+@patch("core.extraction.PdfReader")
+def test_page2_uses_text_layer_when_complete(mock_reader, document):
+    mock_reader.return_value.pages = mock_pages(FORM_TEXT, CARD_TEXT, "")
+    text_service = FakeTextService()
+    pipeline = Pipeline(text_service, FakeFaceService())
+
+    (fields, source), _ = pipeline.run_page2(document)
+    assert fields == FIELDS
+    assert source == "text_layer"
+    assert text_service.calls == []
+
+@patch("core.rendering.convert_from_bytes")
+@patch("core.extraction.PdfReader")
+def test_page2_falls_back_to_ocr_for_image_only_page(mock_reader, mock_convert, document):
+    mock_reader.return_value.pages = mock_pages(FORM_TEXT, "", "")
+    mock_convert.return_value = [mock_image()]
+    text_service = FakeTextService()
+    pipeline = Pipeline(text_service, FakeFaceService())
+
+    (fields, source), _ = pipeline.run_page2(document)
+    assert fields == FIELDS
+    assert source == "textract"
+    assert text_service.calls == [b"\xff\xd8\xff"]
+    mock_convert.assert_called_once_with(PDF_DUMMY, dpi=150, first_page=2, last_page=2)
+
+@patch("core.rendering.convert_from_bytes")
+def test_face_match_stage(mock_convert, document):
+    mock_convert.return_value = [mock_image(), mock_image()]
+    face_service = FakeFaceService(0.81)
+    pipeline = Pipeline(FakeTextService(), face_service)
+
+    similarity, _ = pipeline.run_stage("face_match", document)
+    assert similarity == 0.81
+    assert len(face_service.calls) == 1
+
+@patch("core.rendering.convert_from_bytes")
+def test_prepare_images_sync_success(mock_convert):
+    mock_img = MagicMock()
+    mock_img.convert.return_value.save = MagicMock()
+
+    mock_convert.return_value = [mock_img, mock_img]
+    img1, img2 = prepare_images_sync(PDF_DUMMY)
+
+    assert isinstance(img1, bytes)
+    assert isinstance(img2, bytes)
+
+@patch("core.rendering.convert_from_bytes")
+def test_prepare_images_sync_fail(mock_convert):
+    mock_convert.return_value = [MagicMock()]  # Only 1 image
+    img1, img2 = prepare_images_sync(PDF_DUMMY)
+    assert img1 is None and img2 is None
+
+@patch("core.rendering.convert_from_bytes")
+@patch("core.extraction.PdfReader")
+def test_run_sync_reports_unavailable_dependency(mock_reader, mock_convert, document):
+    mock_reader.return_value.pages = mock_pages(FORM_TEXT, CARD_TEXT, "")
+    face_service = UnavailableFaceService()
+    pipeline = Pipeline(FakeTextService(), face_service)
+
+    stages = pipeline.run_sync(document)
+    assert stages["page2_source"] == "text_layer"
+    assert stages["face"] == (None, 0)
+    assert stages["unavailable"] == ["rekognition"]
+    mock_convert.assert_not_called()
+
+@patch("core.rendering.convert_from_bytes")
+@patch("core.extraction.PdfReader")
+def test_cost_aware_reports_unavailable_dependency(mock_reader, mock_convert, document):
+    # Textract failing fast must not read as a field mismatch that makes face_match moot
+    mock_reader.return_value.pages = mock_pages(FORM_TEXT, "", "")
+    mock_convert.return_value = [mock_image(), mock_image()]
+    face_service = FakeFaceService()
+    pipeline = Pipeline(UnavailableTextService(), face_service)
+
+    stages = asyncio.run(pipeline.run(document, "cost_aware", speculative_ms=None))
+    assert stages["unavailable"] == ["textract"]
+    assert stages["skipped"] == []
+    assert stages["face"][0] == 0.93
+    result = score_stages(stages, PAN_APPLICATION_V1)
+    assert result["field_pass"] is None
+    assert result["overall_pass"] is None
+
+@patch("core.rendering.convert_from_bytes")
+@patch("core.extraction.PdfReader")
+@pytest.mark.parametrize("mode", ["sync", "eager", "cost_aware"])
+def test_replay_miss_fails_the_run_instead_of_scoring(mock_reader, mock_convert, document, mode):
+    # A missing stored response must not read as a field mismatch
+    mock_reader.return_value.pages = mock_pages(FORM_TEXT, "", "")
+    mock_convert.return_value = [mock_image(), mock_image()]
+    pipeline = Pipeline(ReplayMissTextService(), FakeFaceService())
+
+    with pytest.raises(ReplayMiss):
+        if mode == "sync":
+            pipeline.run_sync(document)
+        else:
+            asyncio.run(pipeline.run(document, mode, speculative_ms=None))
+
+@patch("core.extraction.PdfReader")
+def test_cost_aware_skips_face_match_on_field_mismatch(mock_reader, document):
+    mock_reader.return_value.pages = mock_pages(FORM_TEXT, CARD_TEXT.replace("JANE DOE", "MARY ROE"), "")
+    face_service = FakeFaceService()
+    pipeline = Pipeline(FakeTextService(), face_service)
+
+    stages = asyncio.run(pipeline.run(document, "cost_aware"))
+    assert [s["stage"] for s in stages["skipped"]] == ["page2_textract", "face_match"]
+    assert face_service.calls == []
+
+@patch("core.extraction.PdfReader")
+def test_cost_aware_keeps_text_layer_when_page1_is_incomplete(mock_reader, document):
+    mock_reader.return_value.pages = mock_pages(FORM_TEXT.replace("FULL NAME JANE DOE", "FULL NAME"), CARD_TEXT, "")
+    text_service = FakeTextService()
+    pipeline = Pipeline(text_service, FakeFaceService())
+
+    stages = asyncio.run(pipeline.run(document, "cost_aware", speculative_ms=None))
+    assert stages["page2"][0] == FIELDS
+    assert stages["page2_source"] == "text_layer"
+    assert [s["stage"] for s in stages["skipped"]] == ["page2_textract", "face_match"]
+    result = score_stages(stages, PAN_APPLICATION_V1)
+    assert [e["code"] for e in result["errors"]] == ["NAME_MISMATCH"]
+    assert text_service.calls == []
+
+@patch("core.extraction.PdfReader")
+def test_cost_aware_abandons_speculative_stages(mock_reader, document):
+    mock_reader.return_value.pages = mock_pages("PAN NUMBER ABCDE1234F", "", "")
+    text_service = FakeTextService()
+    pipeline = Pipeline(text_service, FakeFaceService())
+
+    async def run():
+        stages = await pipeline.run(document, "cost_aware", speculative_ms=0)
+        await asyncio.gather(*document.background)
+        return stages
+
+    stages = asyncio.run(run())
+    assert [s["cancelled"] for s in stages["skipped"]] == [True, True]
+    assert document.abandoned == {"page2_textract", "face_match"}
+    assert len(document.background) == 2
+    # A stage abandoned before it started does no work
+    assert pipeline.run_stage("page2_textract", document) == (None, 0)
+
+@patch("core.extraction.PdfReader")
+def test_hooks_see_stages_and_cache_skips_them(mock_reader):
+    mock_reader.return_value.pages = mock_pages(FORM_TEXT, CARD_TEXT, "")
+    timings = StageTimings()
+    pipeline = Pipeline(FakeTextService(), FakeFaceService(), hooks=HookChain([StageCache(8), timings]))
+
+    first = pipeline.run_stage("page1", Document(PDF_DUMMY, PAN_APPLICATION_V1))
+    second = pipeline.run_stage("page1", Document(PDF_DUMMY, PAN_APPLICATION_V1))
+    assert second == (first[0], 0)
+    assert mock_reader.call_count == 1
+    assert timings.stats()["page1"]["count"] == 1
+
+@patch("core.templates.PdfReader")
+def test_identify_template_rejects_wrong_page_count(mock_reader):
+    mock_reader.return_value.pages = mock_pages(FORM_TEXT)
+    mock_reader.return_value.pages[0].mediabox.width = 595
+    mock_reader.return_value.pages[0].mediabox.height = 842
+
+    template, error = identify_template(PDF_DUMMY)
+    assert template is None
+    assert error == "Unrecognized document layout"
+
+def mock_pdf(mock_reader, text, pages=3):
+    mock_reader.return_value.pages = mock_pages(text, *[""] * (pages - 1))
+    mock_reader.return_value.pages[0].mediabox.width = 595
+    mock_reader.return_value.pages[0].mediabox.height = 842
+
+@patch("core.templates.PdfReader")
+def test_identify_template_ignores_text_layer_spacing(mock_reader):
+    mock_pdf(mock_reader, FORM_TEXT.replace("PAN NUMBER", "PAN  NUMBER").replace("FULL NAME", "Full\nName"))
+    assert identify_template(PDF_DUMMY) == (PAN_APPLICATION_V1, None)
+
+@patch("core.extraction.PdfReader")
+@patch("core.templates.PdfReader")
+def test_page1_stage_reuses_text_read_for_identification(mock_templates_reader, mock_reader):
+    mock_pdf(mock_templates_reader, FORM_TEXT)
+    document, error = identify_document(PDF_DUMMY)
+    assert error is None
+    assert document.page1_text == FORM_TEXT
+
+    result, _ = Pipeline(FakeTextService(), FakeFaceService()).run_stage("page1", document)
+    assert result == FIELDS
+    mock_reader.assert_not_called()
+
+@patch("core.templates.PdfReader")
+def test_identify_template_picks_most_specific_match(mock_reader, monkeypatch):
+    monkeypatch.setattr(templates, "_templates", dict(templates._templates))
+    def variant(name, anchors):
+        return DocumentTemplate(
+            name, 3, anchors, PAN_APPLICATION_V1.roles, PAN_APPLICATION_V1.form_extractor,
+            PAN_APPLICATION_V1.id_extractor, PAN_APPLICATION_V1.field_patterns
+        )
+    aadhaar = variant("aadhaar_v1", ["AADHAAR NUMBER", "FULL NAME"])
+    linked = variant("pan_aadhaar_v1", ["PAN NUMBER", "AADHAAR NUMBER", "FULL NAME"])
+    register_template(aadhaar)
+    register_template(linked)
+
+    mock_pdf(mock_reader, FORM_TEXT)
+    assert identify_template(PDF_DUMMY) == (PAN_APPLICATION_V1, None)
+    # Another template's anchor on the page does not hide the one that matches
+    mock_pdf(mock_reader, FORM_TEXT.replace("FATHER NAME", "AADHAAR NUMBER 1234 FATHER NAME"))
+    assert identify_template(PDF_DUMMY) == (linked, None)
+    mock_pdf(mock_reader, FORM_TEXT.replace("PAN NUMBER", "AADHAAR NUMBER"))
+    assert identify_template(PDF_DUMMY) == (aadhaar, None)
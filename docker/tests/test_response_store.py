@@ -0,0 +1,67 @@
+import logging
+import os
+from core.response_store import ResponseStore, INDEX_FILE
+
+RESPONSE = {"Blocks": [{"BlockType": "LINE", "Text": "JANE DOE"}]}
+
+def segments(path):
+    return sorted(n for n in os.listdir(path) if n.startswith("segment-"))
+
+def test_put_rolls_over_segments_and_reopens(tmp_path):
+    store = ResponseStore(str(tmp_path), segment_bytes=200)
+    for i in range(10):
+        store.put("textract", f"key-{i}", {**RESPONSE, "n": i})
+    assert len(segments(tmp_path)) > 1
+    assert store.get("textract", "key-3")["n"] == 3
+    store.close()
+
+    store = ResponseStore(str(tmp_path), segment_bytes=200)
+    assert [store.get("textract", f"key-{i}")["n"] for i in range(10)] == list(range(10))
+    assert store.get("rekognition", "key-3") is None
+    store.close()
+
+def test_reopen_recovers_records_missing_from_index(tmp_path):
+    store = ResponseStore(str(tmp_path))
+    store.put("textract", "a", RESPONSE)
+    store.put("textract", "b", RESPONSE)
+    store.close()
+    # Crash after the segment write but before the index line
+    index_path = tmp_path / INDEX_FILE
+    index_path.write_text(index_path.read_text().splitlines(keepends=True)[0])
+
+    store = ResponseStore(str(tmp_path))
+    assert store.get("textract", "b") == RESPONSE
+    store.close()
+    assert "textract:b" in index_path.read_text()
+
+def test_reopen_truncates_half_written_record(tmp_path):
+    store = ResponseStore(str(tmp_path))
+    store.put("textract", "a", RESPONSE)
+    store.close()
+    segment_path = tmp_path / segments(tmp_path)[-1]
+    size = segment_path.stat().st_size
+    with open(segment_path, "ab") as f:
+        f.write(b"\x00\x0btextract:b\x00")
+
+    store = ResponseStore(str(tmp_path))
+    assert segment_path.stat().st_size == size
+    store.put("textract", "b", RESPONSE)
+    assert store.get("textract", "a") == RESPONSE
+    assert store.get("textract", "b") == RESPONSE
+    store.close()
+
+def test_read_only_store_skips_puts_and_sees_new_records(tmp_path, caplog):
+    writer = ResponseStore(str(tmp_path))
+    reader = ResponseStore(str(tmp_path))
+    assert not writer.read_only and reader.read_only
+
+    with caplog.at_level(logging.WARNING, logger="core.response_store"):
+        reader.put("textract", "a", RESPONSE)
+        reader.put("textract", "b", RESPONSE)
+    assert len(caplog.records) == 1
+    assert reader.get("textract", "a") is None
+
+    writer.put("textract", "a", RESPONSE)
+    assert reader.get("textract", "a") == RESPONSE
+    reader.close()
+    writer.close()
@@ -0,0 +1,67 @@
+import io
+import json
+from revalidate import iter_inputs, load_done, repair_checkpoint, rescore
+
+PAGE1 = {"pan": "ABCDE1234F", "name": "JANE DOE", "father_name": "JOHN DOE", "dob": "01/01/1980"}
+
+def write_lines(path, *records):
+    path.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+def test_iter_inputs_walks_directories_and_manifests(tmp_path):
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "2.pdf").write_bytes(b"")
+    (tmp_path / "1.pdf").write_bytes(b"")
+    (tmp_path / "notes.txt").write_text("")
+    assert list(iter_inputs(tmp_path)) == [str(tmp_path / "1.pdf"), str(tmp_path / "b" / "2.pdf")]
+
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# archived batch\n/data/a.pdf\n\n  /data/b.pdf  \n")
+    assert list(iter_inputs(manifest)) == ["/data/a.pdf", "/data/b.pdf"]
+
+def test_load_done_skips_failed_and_undecided_records(tmp_path):
+    output = tmp_path / "results.jsonl"
+    write_lines(
+        output,
+        {"path": "clean.pdf", "stages": {"unavailable": []}},
+        {"path": "layout.pdf", "error": "Unrecognized document layout"},
+        {"path": "miss.pdf", "error": "No stored textract response"},
+        {"path": "down.pdf", "stages": {"unavailable": ["textract"]}},
+        {"sha256": "no path"},
+    )
+    with open(output, "a") as f:
+        f.write('{"path": "half')
+
+    assert load_done(output) == {"clean.pdf"}
+    assert load_done(tmp_path / "missing.jsonl") == set()
+
+def test_repair_checkpoint_terminates_half_written_line(tmp_path):
+    output = tmp_path / "results.jsonl"
+    output.write_text('{"path": "a.pdf"}\n{"path": "b')
+    with open(output, "a+") as out:
+        repair_checkpoint(out)
+        out.write('{"path": "c.pdf"}\n')
+    assert output.read_text() == '{"path": "a.pdf"}\n{"path": "b\n{"path": "c.pdf"}\n'
+    assert load_done(output) == {"a.pdf", "c.pdf"}
+
+    # A complete checkpoint is left alone
+    with open(output, "a+") as out:
+        repair_checkpoint(out)
+    assert output.read_text().endswith('{"path": "c.pdf"}\n')
+
+def test_rescore_applies_current_scoring_to_stage_outputs(tmp_path):
+    previous = tmp_path / "results.jsonl"
+    write_lines(
+        previous,
+        {"path": "a.pdf", "template": "pan_application_v1", "result": {"overall_pass": False},
+         "stages": {"page1": PAGE1, "page2": PAGE1, "similarity": 0.93, "unavailable": []}},
+        {"path": "b.pdf", "error": "Invalid PDF file"},
+    )
+    with open(previous, "a") as f:
+        f.write('{"path": "c')
+
+    out = io.StringIO()
+    assert rescore(previous, out) == 2
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[0]["result"]["overall_pass"] is True
+    assert records[0]["result"]["template"] == "pan_application_v1"
+    assert records[1] == {"path": "b.pdf", "error": "Invalid PDF file"}
@@ -0,0 +1,87 @@
+from core.scoring import get_similarity_score, score_document, score_stages
+from core.templates import PAN_APPLICATION_V1
+
+PAGE1 = {"pan": "ABCDE1234F", "name": "JANE DOE", "father_name": "JOHN DOE", "dob": "01/01/1980"}
+
+def test_exact_match():
+    assert get_similarity_score("hello", "hello") == 100
+
+def test_partial_match():
+    assert get_similarity_score("hello", "helo") > 80
+
+def test_mismatch():
+    assert get_similarity_score("hello", "world") < 50
+
+def test_none_or_empty():
+    assert get_similarity_score("", "hello") == 0
+    assert get_similarity_score(None, "hello") == 0
+
+def test_score_document_pass():
+    result = score_document(PAGE1, dict(PAGE1), 0.93, PAN_APPLICATION_V1)
+    assert result["template"] == "pan_application_v1"
+    assert result["field_pass"] is True
+    assert result["face_match"] == {"similarity": 0.93, "pass": True, "skipped": False}
+    assert result["overall_pass"] is True
+    assert result["errors"] == []
+
+def test_score_document_zero_similarity_is_reported():
+    result = score_document(PAGE1, dict(PAGE1), 0.0, PAN_APPLICATION_V1)
+    assert result["face_match"]["similarity"] == 0.0
+    assert result["overall_pass"] is False
+
+def test_score_document_unavailable_dependency_is_undecided():
+    result = score_document(PAGE1, {}, 0.93, PAN_APPLICATION_V1, unavailable=["textract"])
+    assert result["field_pass"] is None
+    assert result["overall_pass"] is None
+    assert [e["code"] for e in result["errors"]] == ["DEPENDENCY_UNAVAILABLE"]
+
+def test_score_stages_skipped_face_match():
+    skipped = [{"stage": "face_match", "reason": "Field mismatch already fails the document", "cancelled": False}]
+    stages = {
+        "page1": (PAGE1, 5),
+        "page2": ({**PAGE1, "pan": "ZZZZZ9999Z"}, 3),
+        "page2_source": "text_layer",
+        "face": (None, 0),
+        "skipped": skipped,
+        "unavailable": []
+    }
+    result = score_stages(stages, PAN_APPLICATION_V1)
+    assert result["face_match"]["skipped"] is True
+    assert result["skipped_stages"] == skipped
+    assert result["page2_source"] == "text_layer"
+    assert [e["code"] for e in result["errors"]] == ["PAN_MISMATCH"]
+    assert result["overall_pass"] is False
+
+def test_score_stages_skipped_textract_reports_no_field_mismatches():
+    skipped = [{"stage": "page2_textract", "reason": "Face mismatch already fails the document", "cancelled": True}]
+    stages = {
+        "page1": (PAGE1, 5),
+        "page2": ({}, 0),
+        "page2_source": None,
+        "face": (0.2, 40),
+        "skipped": skipped,
+        "unavailable": []
+    }
+    result = score_stages(stages, PAN_APPLICATION_V1)
+    assert result["field_pass"] is None
+    assert result["field_matches"] == {}
+    assert result["errors"] == []
+    assert result["overall_pass"] is False
+
+def test_score_stages_skipped_textract_still_fails_fields_missing_on_page1():
+    skipped = [
+        {"stage": "page2_textract", "reason": "Page 1 is missing dob", "cancelled": False},
+        {"stage": "face_match", "reason": "Page 1 is missing dob", "cancelled": False}
+    ]
+    stages = {
+        "page1": ({**PAGE1, "dob": None}, 5),
+        "page2": ({}, 0),
+        "page2_source": None,
+        "face": (None, 0),
+        "skipped": skipped,
+        "unavailable": []
+    }
+    result = score_stages(stages, PAN_APPLICATION_V1)
+    assert result["field_pass"] is False
+    assert list(result["field_matches"]) == ["dob"]
+    assert [e["code"] for e in result["errors"]] == ["DOB_MISMATCH"]
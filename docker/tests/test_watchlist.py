@@ -0,0 +1,140 @@
+import random
+import time
+import pytest
+from services import watchlist
+from services.watchlist import ScreeningIndex, build_index, normalize_name, trigrams
+
+def dice(a, b):
+    a, b = trigrams(a), trigrams(b)
+    return 200 * len(a & b) / (len(a) + len(b))
+
+def random_name(rng):
+    syllables = ["RA", "HUL", "KU", "MAR", "PRI", "YA", "SHAR", "MA", "AN", "JA", "LI", "MO", "HAN", "DEV", "I"]
+    return " ".join("".join(rng.choice(syllables) for _ in range(rng.randint(1, 3))) for _ in range(rng.randint(2, 3)))
+
+def test_pan_lookup_collects_reused_pans():
+    index = ScreeningIndex()
+    index.add_application("abcde1234f", "app-1")
+    index.add_application("ABCDE 1234 F", "app-2")
+    index.add_application("ABCDE1234F", "app-2")
+    index.add_application("NOT A PAN", "app-3")
+
+    assert index.lookup_pan("ABCDE1234F") == ["app-1", "app-2"]
+    assert index.lookup_pan("ZZZZZ9999Z") == []
+    assert index.stats()["pans"] == 1
+
+def test_lookup_name_scores_and_limits():
+    index = ScreeningIndex(min_threshold=80)
+    index.add_watchlist_name("Rahul Kumar", "w-1")
+    index.add_watchlist_name("RAHUL  KUMAAR", "w-2")
+    index.add_watchlist_name("PRIYA SHARMA", "w-3")
+
+    matches = index.lookup_name("rahul kumar", threshold=80)
+    assert [m["entry_id"] for m in matches] == ["w-1", "w-2"]
+    assert matches[0]["score"] == 100
+    assert index.lookup_name("rahul kumar", threshold=80, limit=1)[0]["entry_id"] == "w-1"
+    assert index.lookup_name("UNRELATED PERSON", threshold=80) == []
+    assert index.lookup_name("", threshold=80) == []
+
+def test_lookup_name_prefix_filter_matches_brute_force():
+    # The prefix and length filters must never drop a name that reaches the threshold
+    rng = random.Random(7)
+    names = [normalize_name(random_name(rng)) for _ in range(1000)]
+    index = ScreeningIndex(min_threshold=60)
+    # Half loaded in bulk, half one by one so later grams get ranked ahead of earlier ones
+    index.add_watchlist_names((name, position) for position, name in enumerate(names[:500]))
+    for position, name in enumerate(names[500:], 500):
+        index.add_watchlist_name(name, position)
+
+    for threshold in (60, 75, 85, 95):
+        for _ in range(25):
+            query = rng.choice(names) if rng.random() < 0.5 else normalize_name(random_name(rng))
+            expected = {position for position, name in enumerate(names) if dice(query, name) >= threshold}
+            found = {m["entry_id"] for m in index.lookup_name(query, threshold=threshold, limit=len(names))}
+            assert found == expected, (query, threshold)
+
+def test_build_index_reads_csvs(tmp_path):
+    applications = tmp_path / "applications.csv"
+    applications.write_text("ABCDE1234F,app-1\nbroken\n")
+    names = tmp_path / "watchlist.csv"
+    names.write_text("JANE DOE,w-1\nJOHN ROE\n")
+
+    index = build_index(str(applications), str(names))
+    assert index.lookup_pan("ABCDE1234F") == ["app-1"]
+    assert [m["entry_id"] for m in index.lookup_name("JOHN ROE")] == [None]
+    assert build_index(str(tmp_path / "missing.csv"), None).stats()["watchlist_names"] == 0
+
+def test_reload_replays_applications_recorded_during_rebuild(tmp_path, monkeypatch):
+    applications = tmp_path / "applications.csv"
+    applications.write_text("ABCDE1234F,app-1\n")
+    monkeypatch.setattr(watchlist, "APPLICATIONS_INDEX_PATH", str(applications))
+    monkeypatch.setattr(watchlist, "_index", ScreeningIndex())
+
+    real_build = watchlist.build_index
+    def build_after_record():
+        # A request lands while the fresh index is being built from a stale file
+        fresh = real_build(str(applications), None)
+        watchlist.record_application("FGHIJ5678K", "app-2")
+        return fresh
+    monkeypatch.setattr(watchlist, "build_index", build_after_record)
+
+    thread = watchlist.reload_index_async()
+    thread.join(5)
+
+    index = watchlist.get_index()
+    assert index.lookup_pan("ABCDE1234F") == ["app-1"]
+    assert index.lookup_pan("FGHIJ5678K") == ["app-2"]
+    assert "FGHIJ5678K,app-2" in applications.read_text()
+
+def test_pan_miss_reads_applications_recorded_by_other_workers(tmp_path, monkeypatch):
+    applications = tmp_path / "applications.csv"
+    applications.write_text("ABCDE1234F,app-1\n")
+    monkeypatch.setattr(watchlist, "APPLICATIONS_INDEX_PATH", str(applications))
+    monkeypatch.setattr(watchlist, "_index", build_index(str(applications), None))
+
+    # Another process appends a row, and is midway through writing the next one
+    with open(applications, "a") as f:
+        f.write("FGHIJ5678K,app-2\nKLMNO")
+    assert watchlist.lookup_prior_applications("FGHIJ5678K") == ["app-2"]
+    assert watchlist.lookup_prior_applications("KLMNO9012P") == []
+
+    with open(applications, "a") as f:
+        f.write("9012P,app-3\n")
+    assert watchlist.lookup_prior_applications("KLMNO9012P") == ["app-3"]
+    assert watchlist.lookup_prior_applications("ABCDE1234F") == ["app-1"]
+
+def test_get_index_rebuilds_when_watchlist_file_changes(tmp_path, monkeypatch):
+    names = tmp_path / "watchlist.csv"
+    names.write_text("JANE MARY DOE,w-1\n")
+    monkeypatch.setattr(watchlist, "WATCHLIST_PATH", str(names))
+    monkeypatch.setattr(watchlist, "SCREENING_CHECK_SECONDS", 0)
+    monkeypatch.setattr(watchlist, "build_index", lambda: build_index(None, str(names)))
+    monkeypatch.setattr(watchlist, "_index", build_index(None, str(names)))
+
+    # Another worker served /screening/reload after the file was edited
+    names.write_text("JANE MARY DOE,w-1\nJOHN PAUL ROE,w-2\n")
+    watchlist.get_index()
+    for _ in range(100):
+        if watchlist._pending is None and watchlist.get_index().stats()["watchlist_names"] == 2:
+            break
+        time.sleep(0.05)
+    assert [m["entry_id"] for m in watchlist.get_index().lookup_name("JOHN PAUL ROE")] == ["w-2"]
+
+def test_lookup_name_groups_duplicate_names():
+    index = ScreeningIndex()
+    index.add_watchlist_names([("JANE MARY DOE", "w-1"), ("Jane  Mary Doe", "w-2"), ("JANE MARY DOES", "w-3")])
+    assert index.stats()["watchlist_names"] == 3
+    assert index.stats()["distinct_watchlist_names"] == 2
+    assert [m["entry_id"] for m in index.lookup_name("JANE MARY DOE")] == ["w-1", "w-2", "w-3"]
+    # Exact entries that fill the limit are returned without a fuzzy search
+    assert [m["entry_id"] for m in index.lookup_name("JANE MARY DOE", limit=2)] == ["w-1", "w-2"]
+
+def test_lookup_name_rejects_threshold_below_index():
+    with pytest.raises(ValueError):
+        ScreeningIndex(min_threshold=85).lookup_name("JANE DOE", threshold=80)
+
+def test_scan_cap_skips_common_grams():
+    index = ScreeningIndex(max_scan=3)
+    index.add_watchlist_names((f"JANE DOE{suffix}", suffix) for suffix in ("", "S", "R", "Y"))
+    assert index.lookup_name("JANE DOEX") == []
+    assert index.stats()["partial_name_lookups"] == 1
@@ -0,0 +1,34 @@
+#!/usr/bin/env bash
+# Compare throughput of the Quart development server (python main.py) against the
+# multi-worker uvicorn profile (python serve.py) on the same machine.
+#
+#   ./compare_serving.sh            # VUS, DURATION and PDF_PATH are passed to k6
+set -euo pipefail
+
+ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+PORT="${SERVER_PORT:-5000}"
+export VUS="${VUS:-20}" DURATION="${DURATION:-30s}" TARGET_URL="http://127.0.0.1:${PORT}/validate"
+mkdir -p logs
+
+wait_for_health() {
+  for _ in $(seq 1 60); do
+    curl -sf "http://127.0.0.1:${PORT}/health" >/dev/null && return 0
+    sleep 1
+  done
+  echo "server did not become healthy" >&2
+  return 1
+}
+
+run() {
+  local name="$1"; shift
+  (cd "$ROOT" && exec "$@") > "logs/${name}.server.log" 2>&1 &
+  local pid=$!
+  wait_for_health
+  k6 run --summary-export "logs/${name}.json" script.js > "logs/${name}.k6.log"
+  kill -TERM "$pid"
+  wait "$pid" || true
+  python3 -c "import json,sys; m=json.load(open(sys.argv[1]))['metrics']; print(f\"{sys.argv[2]:>8}: {m['http_reqs']['rate']:.2f} req/s, p95 {m['http_req_duration']['p(95)']:.0f} ms\")" "logs/${name}.json" "$name"
+}
+
+run dev python main.py
+run uvicorn python serve.py
@@ -2,14 +2,14 @@ import http from 'k6/http';
 import { check, sleep } from 'k6';
 
 export const options = {
-  vus: 10,
-  duration: '10s',
+  vus: __ENV.VUS ? parseInt(__ENV.VUS) : 10,
+  duration: __ENV.DURATION || '10s',
 };
 
-const pdfFile = open('docs/sample.pdf', 'b');
+const pdfFile = open(__ENV.PDF_PATH || 'docs/sample.pdf', 'b');
 
 export default function () {
-  const url = 'https://g82p2ksxoe.execute-api.us-east-1.amazonaws.com/test/validate';
+  const url = __ENV.TARGET_URL || 'https://g82p2ksxoe.execute-api.us-east-1.amazonaws.com/test/validate';
 
   const formData = {
     file: http.file(pdfFile, 'sample.pdf'),
@@ -1,105 +1,136 @@
 import time
 import asyncio
+import logging
 from quart import Quart, request, jsonify
-from io import BytesIO
 
-from services.utils import (
-    generate_application_id, validate_pdf_file, 
-    validate_pdf_pages, get_current_timestamp
-)
-from services.async_processors import (
-    extract_page1_data, extract_page2_data_via_textract, compare_faces_async
-)
-from services.validators import validate_fields, validate_face_match
+from core.adapters import QuartRequestAdapter, InvalidDocument
+from core.config import SCHEDULING_MODE
+from core.pipeline import identify_document, stage_metrics
+from core.scoring import score_stages
+from core.utils import generate_application_id, get_current_timestamp
+from services.memory_budget import budget, estimate_footprint, MemoryBudgetExceeded
+from services.async_processors import executor, pipeline, stage_timings
+from services.warmup import warm_up
+from services.logger import configure_logging, request_id, log_timing, log_stats
+from services.validators import validate_screening
+from services.watchlist import load_index, record_application, reload_index_async, get_index
+
+configure_logging()
+logger = logging.getLogger(__name__)
 
 app = Quart(__name__)
 
+@app.before_serving
+async def load_screening_index():
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, load_index)
+
+@app.before_serving
+async def warm_up_worker():
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, warm_up, executor)
+
+@app.after_serving
+async def drain_executor():
+    # In-flight requests have finished by now; let queued executor work complete
+    loop = asyncio.get_event_loop()
+    await loop.run_in_executor(None, executor.shutdown, True)
+
 @app.route("/validate", methods=["POST"])
 async def validate_pdf():
     start_time = time.time()
+    application_id = generate_application_id()
+    request_id.set(application_id)
+    adapter = QuartRequestAdapter(request)
 
     try:
-        files = await request.files
-        file = files.get("file")
-        
-        # Validate file
-        is_valid, error = validate_pdf_file(file)
-        if not is_valid:
-            return jsonify({"error": error}), 400
-
-        pdf_data = file.read()
-        
-        # Validate PDF pages
-        is_valid, error = validate_pdf_pages(pdf_data)
-        if not is_valid:
-            return jsonify({"error": error}), 400
+        try:
+            pdf_data = await adapter.read_document()
+        except InvalidDocument as e:
+            return adapter.respond(400, {"error": str(e)})
+
+        # Pick the document template from page count, page-1 anchors and page size
+        document, error = await pipeline.run_in_executor(identify_document, pdf_data)
+        if document is None:
+            return adapter.respond(400, {"error": error})
+        template = document.template
+        footprint = await pipeline.run_in_executor(estimate_footprint, pdf_data, template)
 
         parallel_start = time.time()
-        
-        pdf_bytes1 = BytesIO(pdf_data)
-        pdf_bytes2 = BytesIO(pdf_data)
-        
-        # Run all tasks concurrently
-        results = await asyncio.gather(
-            extract_page1_data(pdf_bytes1),
-            extract_page2_data_via_textract(pdf_bytes2),
-            compare_faces_async(pdf_data),
-            return_exceptions=True
-        )
-        
+
+        mode = adapter.query("scheduling", SCHEDULING_MODE)
+        try:
+            # Hold the document's estimated buffer footprint for as long as pages are
+            # rendered, including abandoned stages that finish after the response
+            async with budget.reserve(footprint) as reservation:
+                stages = await pipeline.run(document, mode)
+                reservation.hold_until(document.background)
+        except MemoryBudgetExceeded:
+            logger.warning("Memory budget exhausted, shedding request", extra={"memory": budget.stats()})
+            return adapter.respond(503, {"error": "Server is busy, retry later"}, {"Retry-After": "5"})
+
         parallel_end = time.time()
-        
-        # Extract results
-        page1_data, page1_time = results[0] if not isinstance(results[0], Exception) else ({}, 0)
-        page2_data, page2_time = results[1] if not isinstance(results[1], Exception) else ({}, 0)
-        similarity, face_time = results[2] if not isinstance(results[2], Exception) else (None, 0)
-
-        # Validate fields
-        field_scores, field_pass, field_errors = validate_fields(page1_data, page2_data)
-        
-        # Validate face match
-        face_pass, face_error = validate_face_match(similarity)
-        
-        # Collect all errors
-        errors = field_errors
-        if face_error:
-            errors.append(face_error)
+
+        page1_data = stages["page1"][0]
+        page2_data = stages["page2"][0]
+        result = score_stages(stages, template)
+
+        # Screen against prior applications and the watchlist (name lookups are CPU-bound)
+        screening, screening_errors = await pipeline.run_in_executor(validate_screening, page1_data, page2_data)
+        result["errors"].extend(screening_errors)
 
         # Calculate metrics
         total_time = time.time() - start_time
         metrics = {
-            "page1_ocr_ms": page1_time,
-            "page2_textract_ms": page2_time,
-            "face_match_ms": face_time,
-            "ocr_ms": page1_time + page2_time,
+            **stage_metrics(stages),
             "parallel_processing_ms": int((parallel_end - parallel_start) * 1000),
             "total_processing_ms": int(total_time * 1000),
             "total_processing_seconds": round(total_time, 2)
         }
 
-        result = {
-            "application_id": generate_application_id(),
-            "field_matches": field_scores,
-            "field_pass": field_pass,
-            "face_match": {
-                "similarity": round(similarity, 2) if similarity is not None else None,
-                "pass": face_pass
-            },
-            "overall_pass": field_pass and face_pass,
-            "errors": errors,
+        body = {
+            "application_id": application_id,
+            **result,
+            "screening": screening,
             "processed_at": get_current_timestamp(),
             "metrics": metrics
         }
 
-        return jsonify(result)
+        # Only applications that passed count as prior applications; recording failed or
+        # undecided ones would flag the applicant's corrected resubmission as a duplicate
+        if body["overall_pass"]:
+            await pipeline.run_in_executor(
+                record_application, page1_data.get("pan") or page2_data.get("pan"), application_id
+            )
+
+        log_timing(logger, "Validation completed", metrics["total_processing_ms"], overall_pass=body["overall_pass"])
+        return adapter.respond(200, body)
 
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        logger.exception("Validation failed")
+        return adapter.respond(500, {"error": str(e)})
+
+@app.route("/screening/reload", methods=["POST"])
+async def reload_screening_index():
+    # Rebuilds this worker's index now; other serve.py workers follow once they see
+    # the watchlist file change (see services/watchlist.get_index)
+    started = reload_index_async() is not None
+    return jsonify({
+        "reloading": started,
+        "index": get_index().stats()
+    }), 202 if started else 409
 
 @app.route("/health", methods=["GET"])
 async def health_check():
     return jsonify({
         "status": "healthy", 
+        "dependencies": {
+            "textract": pipeline.text_service.breaker.state,
+            "rekognition": pipeline.face_service.breaker.state
+        },
+        "memory": budget.stats(),
+        "stages": stage_timings.stats(),
+        "logging": log_stats(),
         "timestamp": get_current_timestamp()
     })
 
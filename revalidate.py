@@ -0,0 +1,180 @@
+"""Offline bulk re-validation of archived PDFs.
+
+    python revalidate.py archive/ -o results.jsonl --workers 8
+    python revalidate.py manifest.txt -o results.jsonl          # one PDF path per line
+    python revalidate.py --rescore-from results.jsonl -o rescored.jsonl
+    python revalidate.py archive/ -o results.jsonl --replay responses/
+
+Each processed document is appended to the output as one JSON line and flushed, so
+the output doubles as the checkpoint: re-running with the same output skips every
+path already recorded cleanly. Documents that failed or were scored while a dependency
+was unavailable are retried, and the new record is appended after the old one. --rescore-from re-applies the current thresholds to the stage
+outputs of a previous run without touching PDFs or AWS. --replay re-runs extraction
+and scoring over Textract/Rekognition responses recorded in a response store.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def iter_inputs(source):
+    source = Path(source)
+    if source.is_dir():
+        yield from (str(p) for p in sorted(source.rglob("*.pdf")))
+        return
+    with open(source) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def load_done(output_path):
+    done = set()
+    try:
+        with open(output_path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    path = record["path"]
+                except (ValueError, KeyError):
+                    # Partially written line from an interrupted run
+                    continue
+                # Only clean records count as done; failed documents (e.g. a replay
+                # miss) and those scored without an unavailable dependency are retried
+                if "error" not in record and not record.get("stages", {}).get("unavailable"):
+                    done.add(path)
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def repair_checkpoint(out):
+    # Terminate a line left half-written by a crash so new records stay parseable
+    out.seek(0, os.SEEK_END)
+    if out.tell() > 0:
+        out.seek(out.tell() - 1)
+        if out.read(1) != "\n":
+            out.write("\n")
+
+
+def init_worker():
+    # Import inside the (spawned) worker so every process builds its own boto clients
+    global pipeline, identify_document, score_document, stage_metrics, request_id
+    from core.pipeline import Pipeline, identify_document, stage_metrics
+    from core.providers import aws_services
+    from core.scoring import score_document
+    from services.logger import configure_logging, request_id
+    configure_logging(sys.stderr)
+    pipeline = Pipeline(*aws_services())
+
+
+def process_path(path):
+    start_time = time.time()
+    record = {"path": path}
+    request_id.set(path)
+    try:
+        pdf_data = Path(path).read_bytes()
+        record["sha256"] = hashlib.sha256(pdf_data).hexdigest()
+
+        document, error = identify_document(pdf_data)
+        if document is None:
+            record["error"] = error
+            return record
+
+        template = document.template
+        record["template"] = template.name
+        stages = pipeline.run_sync(document)
+
+        record["stages"] = {
+            "page1": stages["page1"][0],
+            "page2": stages["page2"][0],
+            "page2_source": stages["page2_source"],
+            "similarity": stages["face"][0],
+            "unavailable": stages["unavailable"]
+        }
+        record["result"] = score_document(
+            stages["page1"][0], stages["page2"][0], stages["face"][0], template, stages["unavailable"]
+        )
+        record["metrics"] = {
+            **stage_metrics(stages),
+            "total_processing_ms": int((time.time() - start_time) * 1000)
+        }
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+
+def rescore(previous_path, out):
+    from core.scoring import score_document
+    from core.templates import PAN_APPLICATION_V1, get_template
+
+    count = 0
+    with open(previous_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            stages = record.get("stages")
+            if stages is not None:
+                template = get_template(record.get("template")) or PAN_APPLICATION_V1
+                record["result"] = score_document(
+                    stages["page1"], stages["page2"], stages["similarity"], template, stages.get("unavailable", ())
+                )
+            out.write(json.dumps(record, separators=(",", ":")) + "\n")
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run document validation over an archive of PDFs")
+    parser.add_argument("source", nargs="?", help="directory of PDFs or a manifest file with one path per line")
+    parser.add_argument("-o", "--output", required=True, help="JSONL output (also used as the resume checkpoint)")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--replay", metavar="STORE", help="serve AWS calls from this response store only")
+    parser.add_argument("--record", metavar="STORE", help="record AWS responses into this response store")
+    parser.add_argument("--rescore-from", help="re-score stage outputs from a previous run's JSONL; no PDFs or AWS calls")
+    args = parser.parse_args()
+
+    if args.rescore_from:
+        with open(args.output, "w") as out:
+            count = rescore(args.rescore_from, out)
+        print(f"Re-scored {count} records", file=sys.stderr)
+        return
+
+    if not args.source:
+        parser.error("source is required unless --rescore-from is given")
+
+    if args.replay or args.record:
+        # Spawned workers inherit the environment before importing core.config
+        os.environ["RESPONSE_STORE_PATH"] = args.replay or args.record
+        os.environ["RESPONSE_STORE_MODE"] = "replay" if args.replay else "record"
+        if args.workers > 1 and args.record:
+            parser.error("--record writes a single store and needs --workers 1")
+
+    done = load_done(args.output)
+    pending = [p for p in iter_inputs(args.source) if p not in done]
+    print(f"{len(done)} already processed, {len(pending)} remaining", file=sys.stderr)
+
+    start_time = time.time()
+    ctx = multiprocessing.get_context("spawn")
+    with open(args.output, "a+") as out, ctx.Pool(args.workers, initializer=init_worker) as pool:
+        repair_checkpoint(out)
+        for i, record in enumerate(pool.imap_unordered(process_path, pending, chunksize=4), 1):
+            out.write(json.dumps(record, separators=(",", ":")) + "\n")
+            out.flush()
+            if i % 100 == 0:
+                rate = i / (time.time() - start_time)
+                print(f"{i}/{len(pending)} ({rate:.1f} docs/s)", file=sys.stderr)
+
+    print(f"Processed {len(pending)} documents in {round(time.time() - start_time, 2)}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import sys
+import uvicorn
+from core.config import RESPONSE_STORE_PATH, RESPONSE_STORE_MODE
+from services.config import SERVER_HOST, SERVER_PORT, SERVER_WORKERS, GRACEFUL_SHUTDOWN_SECONDS
+
+try:
+    import uvloop  # noqa: F401
+    LOOP = "uvloop"
+except ImportError:
+    LOOP = "asyncio"
+
+if __name__ == "__main__":
+    if RESPONSE_STORE_PATH and RESPONSE_STORE_MODE == "record" and SERVER_WORKERS > 1:
+        # Only the worker holding the store lock would record; the rest would drop responses
+        sys.exit("RESPONSE_STORE_MODE=record writes a single store and needs SERVER_WORKERS=1")
+    # Each worker process imports main:app on its own and runs the before_serving
+    # hooks (screening index, boto clients, renderer, executor threads) before it
+    # accepts connections. On SIGTERM, workers stop accepting and drain in-flight
+    # requests for up to GRACEFUL_SHUTDOWN_SECONDS.
+    #
+    # Workers share no memory:
+    # - every worker holds a full copy of the screening index (size the host for
+    #   SERVER_WORKERS copies of the watchlist);
+    # - /screening/reload rebuilds the worker that served it; the others rebuild
+    #   when they see WATCHLIST_PATH change (SCREENING_CHECK_SECONDS);
+    # - applications are shared through APPLICATIONS_INDEX_PATH, which a worker
+    #   re-reads before reporting a PAN as unseen;
+    # - MEMORY_BUDGET_MB is divided between the workers.
+    uvicorn.run(
+        "main:app",
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        workers=SERVER_WORKERS,
+        loop=LOOP,
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_SECONDS,
+        access_log=False,
+    )
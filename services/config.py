@@ -1,11 +1,36 @@
+import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-SIMILARITY_THRESHOLD = 80
-FACE_SIMILARITY_THRESHOLD = 0.7
-REKOGNITION_THRESHOLD = 70
-PDF_DPI = 200
-MIN_PAGES_REQUIRED = 3
+# Pipeline thresholds, rendering, scheduling, breaker and response-store settings are
+# shared with the Lambda handler and live in core/config.py
+
 MAX_PDF_SIZE = 10
-MAX_WORKERS = 4
\ No newline at end of file
+# Cap on estimated in-flight document memory for the whole server, split evenly across
+# the SERVER_WORKERS processes, and how long a request may wait for room before it is
+# shed with 503. Set SERVER_WORKERS=1 when running main.py directly.
+MEMORY_BUDGET_MB = int(os.getenv("MEMORY_BUDGET_MB", 1024))
+MEMORY_WAIT_SECONDS = float(os.getenv("MEMORY_WAIT_SECONDS", 5))
+
+# Duplicate-application / watchlist screening (CSV files: "pan,application_id" and "name,entry_id")
+APPLICATIONS_INDEX_PATH = os.getenv("APPLICATIONS_INDEX_PATH")
+WATCHLIST_PATH = os.getenv("WATCHLIST_PATH")
+WATCHLIST_NAME_THRESHOLD = 85
+# Posting entries a name lookup may scan (0: no cap). Past the cap the most common
+# probe grams are skipped and the lookup counts as partial in the index stats
+WATCHLIST_MAX_SCAN = int(os.getenv("WATCHLIST_MAX_SCAN", 50000))
+# How often each worker checks whether WATCHLIST_PATH changed and rebuilds its index
+SCREENING_CHECK_SECONDS = float(os.getenv("SCREENING_CHECK_SECONDS", 5))
+
+# Production serving (serve.py)
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", 5000))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", os.cpu_count() or 1))
+GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", 30))
+
+# Structured logging (services/logger.py)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_BATCH_SIZE = 256
+# Records waiting for the writer thread; past this, new records are dropped and counted
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
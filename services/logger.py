@@ -0,0 +1,161 @@
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+from core.hooks import PipelineHooks
+from core.timing import log_timing
+from services.config import LOG_LEVEL, LOG_BATCH_SIZE, LOG_QUEUE_SIZE
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id"}
+
+
+class ContextFilter(logging.Filter):
+    # Runs in the calling thread, so the request id is still in context
+    def filter(self, record):
+        record.request_id = request_id.get()
+        return True
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    # Like QueueHandler, but without copying and pre-formatting each record. A full
+    # queue drops the record and counts it instead of blocking the caller.
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRS:
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class BatchWriter(threading.Thread):
+    # Drains the log queue off the hot path, writing up to LOG_BATCH_SIZE lines per flush
+
+    def __init__(self, log_queue, stream, formatter):
+        super().__init__(name="log-writer", daemon=True)
+        self.queue = log_queue
+        self.stream = stream
+        self.formatter = formatter
+        self.write_errors = 0
+        self._failing = False
+
+    def run(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            batch = [record]
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            self.write(batch)
+            if stop:
+                return
+
+    def write(self, batch):
+        # A failing stream (e.g. BrokenPipeError) costs the batch, not the writer: if
+        # this thread died the queue would fill and every later line would be dropped
+        try:
+            lines = [self.formatter.format(r) for r in batch if r is not None]
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except Exception as e:
+            self.write_errors += 1
+            if not self._failing:
+                # Reported once per run of failures; the count is in log_stats()
+                self._failing = True
+                try:
+                    print(f"log writer: {e!r}; dropping lines until the stream recovers", file=sys.stderr)
+                except Exception:
+                    pass
+            return
+        self._failing = False
+
+    def stop(self, timeout=5):
+        # Bounded so a stuck stream cannot hang interpreter exit
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self.join(timeout)
+
+
+_writer = None
+_handler = None
+
+
+def configure_logging(stream=sys.stdout):
+    global _writer, _handler
+    if _writer is not None:
+        return
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    handler = _handler = RecordQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    root.handlers = [handler]
+
+    _writer = BatchWriter(log_queue, stream, JsonFormatter())
+    _writer.start()
+    atexit.register(_writer.stop)
+
+
+def log_stats():
+    if _writer is None:
+        return None
+    return {
+        "queued": _writer.queue.qsize(),
+        "dropped": _handler.dropped,
+        "write_errors": _writer.write_errors
+    }
+
+
+class LoggingHooks(PipelineHooks):
+    # One sampled timing line per pipeline stage, tagged with the request id
+    logger = logging.getLogger("core.pipeline")
+
+    def after_stage(self, stage, document, result, duration_ms):
+        log_timing(self.logger, "Stage completed", duration_ms, stage=stage)
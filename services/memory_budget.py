@@ -0,0 +1,119 @@
+import asyncio
+from io import BytesIO
+from pypdf import PdfReader
+from core.config import TEXTRACT_DPI, FACE_DPI
+from services.config import MEMORY_BUDGET_MB, MEMORY_WAIT_SECONDS, SERVER_WORKERS
+
+POINTS_PER_INCH = 72
+# pdftoppm output is read into memory before PIL decodes it, then converted to RGB
+BITMAP_COPIES = 3
+# (dpi, pages) rendered by each stage; see core/rendering.py
+RENDER_PASSES = ((TEXTRACT_DPI, ("id_card",)), (FACE_DPI, ("id_card", "selfie")))
+
+
+class MemoryBudgetExceeded(Exception):
+    pass
+
+
+class MemoryBudget:
+    # Per-process cap on the estimated bytes held by in-flight documents. A request
+    # larger than the whole budget is clamped so it can still run on its own.
+
+    def __init__(self, capacity_bytes):
+        self.capacity = capacity_bytes
+        self.in_use = 0
+        self.peak = 0
+        self.waiting = 0
+        self._condition = None
+        self._deferred = set()
+
+    def _get_condition(self):
+        # Created lazily so it binds to the serving event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self, nbytes, timeout=MEMORY_WAIT_SECONDS):
+        nbytes = min(nbytes, self.capacity)
+        condition = self._get_condition()
+        async with condition:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(
+                    condition.wait_for(lambda: self.in_use + nbytes <= self.capacity),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                raise MemoryBudgetExceeded(f"Could not reserve {nbytes} bytes within {timeout}s")
+            finally:
+                self.waiting -= 1
+            self.in_use += nbytes
+            self.peak = max(self.peak, self.in_use)
+        return nbytes
+
+    async def release(self, nbytes):
+        condition = self._get_condition()
+        async with condition:
+            self.in_use -= nbytes
+            condition.notify_all()
+
+    def reserve(self, nbytes, timeout=MEMORY_WAIT_SECONDS):
+        return Reservation(self, nbytes, timeout)
+
+    def stats(self):
+        return {
+            "budget_bytes": self.capacity,
+            "live_bytes": self.in_use,
+            "peak_bytes": self.peak,
+            "waiting_requests": self.waiting
+        }
+
+
+class Reservation:
+    def __init__(self, budget, nbytes, timeout):
+        self.budget = budget
+        self.nbytes = nbytes
+        self.timeout = timeout
+        self.reserved = 0
+        self.pending = []
+
+    def hold_until(self, tasks):
+        # Keep the bytes reserved past the block until `tasks` (work still holding the
+        # document's buffers) finish, without making the caller wait for them
+        self.pending = list(tasks)
+
+    async def __aenter__(self):
+        self.reserved = await self.budget.acquire(self.nbytes, self.timeout)
+        return self
+
+    async def __aexit__(self, *exc):
+        pending = [task for task in self.pending if not task.done()]
+        if not pending:
+            await self.budget.release(self.reserved)
+            return
+        release = asyncio.ensure_future(self._release_after(pending))
+        self.budget._deferred.add(release)
+        release.add_done_callback(self.budget._deferred.discard)
+
+    async def _release_after(self, pending):
+        try:
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            await self.budget.release(self.reserved)
+
+
+def estimate_footprint(pdf_data, template):
+    # Upload bytes plus, per render pass, the decoded bitmaps of the pages it renders
+    reader = PdfReader(BytesIO(pdf_data))
+    total = 2 * len(pdf_data)
+    for dpi, roles in RENDER_PASSES:
+        for role in roles:
+            page = reader.pages[template.roles[role] - 1]
+            width = float(page.mediabox.width) / POINTS_PER_INCH * dpi
+            height = float(page.mediabox.height) / POINTS_PER_INCH * dpi
+            total += int(width * height * 3) * BITMAP_COPIES
+    return total
+
+
+# Each serve.py worker is a separate process with its own share of the server's budget
+budget = MemoryBudget(MEMORY_BUDGET_MB * 1024 * 1024 // max(SERVER_WORKERS, 1))
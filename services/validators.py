@@ -1,41 +1,32 @@
-from difflib import SequenceMatcher
-from services.config import SIMILARITY_THRESHOLD, FACE_SIMILARITY_THRESHOLD
+from services.watchlist import get_index, lookup_prior_applications
 
-def get_similarity_score(a, b):
-    if not a or not b:
-        return 0
-    return round(SequenceMatcher(None, a.strip(), b.strip()).ratio() * 100)
+def validate_screening(page1_data, page2_data):
+    index = get_index()
+    pan = page1_data.get("pan") or page2_data.get("pan")
+    names = {n for n in (page1_data.get("name"), page2_data.get("name")) if n}
+
+    prior_applications = lookup_prior_applications(pan)
+    watchlist_matches = []
+    for name in names:
+        for match in index.lookup_name(name):
+            if match not in watchlist_matches:
+                watchlist_matches.append(match)
 
-def validate_fields(page1_data, page2_data):
-    fields = ["name", "father_name", "dob", "pan"]
-    field_scores = {}
-    field_pass = True
     errors = []
-    
-    for f in fields:
-        score = get_similarity_score(page1_data.get(f), page2_data.get(f))
-        passed = score >= SIMILARITY_THRESHOLD
-        field_scores[f] = {
-            "score": score, 
-            "pass": passed,
-            "page1_value": page1_data.get(f),
-            "page2_value": page2_data.get(f)
-        }
-        if not passed:
-            field_pass = False
-            errors.append({
-                "code": f"{f.upper()}_MISMATCH",
-                "message": f"{f.replace('_', ' ').title()} differs between Page 1 and PAN card"
-            })
-    
-    return field_scores, field_pass, errors
+    if prior_applications:
+        errors.append({
+            "code": "DUPLICATE_PAN",
+            "message": "PAN was used in a previous application"
+        })
+    if watchlist_matches:
+        errors.append({
+            "code": "WATCHLIST_MATCH",
+            "message": "Name is similar to a watchlist entry"
+        })
 
-def validate_face_match(similarity):
-    if similarity is None:
-        return False, {
-            "code": "FACE_MATCH_ERROR",
-            "message": "Could not process face comparison"
-        }
-    
-    face_pass = similarity >= FACE_SIMILARITY_THRESHOLD
-    return face_pass, None
\ No newline at end of file
+    screening = {
+        "prior_applications": prior_applications,
+        "watchlist_matches": watchlist_matches,
+        "flagged": bool(errors)
+    }
+    return screening, errors
\ No newline at end of file
@@ -0,0 +1,33 @@
+import threading
+from io import BytesIO
+from PIL import Image
+from pdf2image import convert_from_bytes
+from core.config import MAX_WORKERS
+from core.extraction import extract_fields_page1, extract_fields_page2
+
+SAMPLE_PAGE1 = "PAN NUMBER ABCDE1234F\nFULL NAME JOHN DOE\nDATE OF BIRTH 01/01/1990\nFATHER NAME RICHARD DOE"
+SAMPLE_PAGE2 = "Permanent Account Number Card ABCDE1234F\nName: JOHN DOE\nFather's Name: RICHARD DOE\nDate of Birth 01/01/1990"
+
+
+def warm_renderer():
+    # Spawn pdftoppm once so the binary and its libraries are loaded before traffic
+    buf = BytesIO()
+    Image.new("RGB", (32, 32), "white").save(buf, format="PDF")
+    convert_from_bytes(buf.getvalue(), dpi=72)
+
+
+def warm_executor(executor):
+    # Occupy every slot at once so the pool starts all of its threads now
+    barrier = threading.Barrier(MAX_WORKERS)
+    futures = [executor.submit(barrier.wait, 5) for _ in range(MAX_WORKERS)]
+    for future in futures:
+        future.result()
+
+
+def warm_up(executor):
+    # The boto clients were built (service models loaded, credentials resolved) when
+    # services.async_processors was imported
+    extract_fields_page1(SAMPLE_PAGE1)
+    extract_fields_page2(SAMPLE_PAGE2)
+    warm_renderer()
+    warm_executor(executor)
@@ -0,0 +1,322 @@
+import csv
+import os
+import re
+import threading
+import time
+from array import array
+from collections import Counter
+from fractions import Fraction
+from itertools import compress
+from math import ceil
+from operator import ge
+from services.config import (
+    APPLICATIONS_INDEX_PATH, WATCHLIST_PATH, WATCHLIST_NAME_THRESHOLD, WATCHLIST_MAX_SCAN, SCREENING_CHECK_SECONDS
+)
+
+PAN_PATTERN = re.compile(r"[A-Z]{5}[0-9]{4}[A-Z]")
+
+
+def normalize_pan(pan):
+    if not pan:
+        return None
+    pan = re.sub(r"[^A-Z0-9]", "", pan.upper())
+    return pan if PAN_PATTERN.fullmatch(pan) else None
+
+
+def normalize_name(name):
+    if not name:
+        return None
+    name = " ".join(re.sub(r"[^A-Z ]", " ", name.upper()).split())
+    return name or None
+
+
+def trigrams(name):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ScreeningIndex:
+    # PAN -> application id (a tuple once a PAN is reused), and an approximate index
+    # over distinct watchlist names. Each distinct name is stored once with its entry
+    # id (a tuple when several entries share the name) and its trigram ids, rarest
+    # first, as a tuple.
+    #
+    # Name lookups use prefix filtering: trigrams have a fixed global order, rarest
+    # first, and two names with Dice >= t must share a gram among the first
+    # n - ceil(t * n / (2 - t)) + 1 grams of each. A name is only posted under that
+    # prefix (for t = min_threshold), so common grams such as "KUM" or "AR " have
+    # short posting lists. Candidates are then checked with map/compress pipelines
+    # so the per-candidate work stays in C.
+
+    def __init__(self, min_threshold=WATCHLIST_NAME_THRESHOLD, max_scan=WATCHLIST_MAX_SCAN):
+        self.min_threshold = min_threshold
+        self.max_scan = max_scan
+        self._lock = threading.Lock()
+        self._pans = {}
+        self._names = []
+        self._name_positions = {}
+        self._name_refs = []
+        self._name_grams = []
+        self._gram_ids = {}
+        # Probe order per gram id; lower is rarer. Never changes once assigned: grams
+        # first seen later are ranked before every existing gram
+        self._gram_ranks = array("i")
+        self._postings = []
+        self._max_name_size = 0
+        self._entry_count = 0
+        self._partial_lookups = 0
+        # Where the applications CSV was read up to, and the watchlist file it was built from
+        self.applications_offset = 0
+        self.watchlist_signature = None
+
+    def add_application(self, pan, application_id):
+        pan = normalize_pan(pan)
+        if not pan:
+            return
+        with self._lock:
+            existing = self._pans.get(pan)
+            if existing is None:
+                self._pans[pan] = application_id
+            elif isinstance(existing, str):
+                if existing != application_id:
+                    self._pans[pan] = (existing, application_id)
+            elif application_id not in existing:
+                self._pans[pan] = existing + (application_id,)
+
+    def add_watchlist_name(self, name, entry_id):
+        self.add_watchlist_names([(name, entry_id)])
+
+    def add_watchlist_names(self, entries):
+        # Grams new to the index are ranked by their frequency within `entries`, so
+        # loading the whole watchlist in one call gives the best probe order
+        entries = [(name, entry_id) for name, entry_id in ((normalize_name(n), e) for n, e in entries) if name]
+        with self._lock:
+            new_names = {name for name, _ in entries if name not in self._name_positions}
+            counts = Counter(gram for name in new_names for gram in trigrams(name) if gram not in self._gram_ids)
+            next_rank = self._gram_ranks[-1] if self._gram_ranks else 0
+            for gram, _ in counts.most_common():
+                self._gram_ids[gram] = len(self._postings)
+                next_rank -= 1
+                self._gram_ranks.append(next_rank)
+                self._postings.append(array("I"))
+
+            self._entry_count += len(entries)
+            for name, entry_id in entries:
+                position = self._name_positions.get(name)
+                if position is not None:
+                    refs = self._name_refs[position]
+                    self._name_refs[position] = (refs + (entry_id,)) if isinstance(refs, tuple) else (refs, entry_id)
+                    continue
+                position = self._name_positions[name] = len(self._names)
+                self._names.append(name)
+                self._name_refs.append(entry_id)
+                gram_ids = tuple(sorted((self._gram_ids[gram] for gram in trigrams(name)), key=self._gram_ranks.__getitem__))
+                self._name_grams.append(gram_ids)
+                self._max_name_size = max(self._max_name_size, len(gram_ids))
+                for gram_id in gram_ids[:self._prefix_length(len(gram_ids), self.min_threshold)]:
+                    self._postings[gram_id].append(position)
+
+    @staticmethod
+    def _min_shared(size, threshold):
+        # Dice >= threshold needs at least this many shared grams with any partner;
+        # fractions since float division can land just past an integer
+        ratio = Fraction(threshold) / 100
+        return max(1, ceil(ratio * size / (2 - ratio)))
+
+    @classmethod
+    def _prefix_length(cls, size, threshold):
+        return size - cls._min_shared(size, threshold) + 1
+
+    def lookup_pan(self, pan):
+        ids = self._pans.get(normalize_pan(pan))
+        if ids is None:
+            return []
+        return [ids] if isinstance(ids, str) else list(ids)
+
+    def lookup_name(self, name, threshold=WATCHLIST_NAME_THRESHOLD, limit=5):
+        if threshold < self.min_threshold:
+            raise ValueError(f"Index only supports thresholds from {self.min_threshold}")
+        name = normalize_name(name)
+        if not name:
+            return []
+
+        # Enough exact entries already fill the result; nothing can score higher
+        position = self._name_positions.get(name)
+        if position is not None and len(self._entries(position)) >= limit:
+            return self._matches([(position, 100)], limit)
+
+        query = trigrams(name)
+        size = len(query)
+        min_shared = self._min_shared(size, threshold)
+        # Shared grams a candidate of each size needs; sizes the bound rules out get
+        # an unreachable count
+        need = [size + 1] * (self._max_name_size + 1)
+        for candidate_size in range(min_shared, len(need)):
+            shared = ceil(Fraction(threshold) * (size + candidate_size) / 200)
+            if shared <= min(size, candidate_size):
+                need[candidate_size] = shared
+
+        # Grams never seen in the watchlist are in no name; they rank first
+        ranks = self._gram_ranks
+        query_ids = {self._gram_ids.get(gram, -1 - i) for i, gram in enumerate(query)}
+        grams = sorted(query_ids, key=lambda g: ranks[g] if g >= 0 else -len(ranks) - 1 + g)
+        postings = [self._postings[g] for g in grams[:size - min_shared + 1] if g >= 0]
+        if self.max_scan:
+            scanned = 0
+            for i, posting in enumerate(postings):
+                scanned += len(posting)
+                if scanned > self.max_scan:
+                    # Only names made of very common grams get here; keep latency bounded
+                    postings = postings[:i]
+                    self._partial_lookups += 1
+                    break
+        candidates = list(set().union(*postings))
+
+        gram_lists = list(map(self._name_grams.__getitem__, candidates))
+        shared = map(len, map(query_ids.intersection, gram_lists))
+        passed = compress(candidates, map(ge, shared, map(need.__getitem__, map(len, gram_lists))))
+        scored = [
+            (position, round(200 * len(query_ids.intersection(self._name_grams[position]))
+                             / (size + len(self._name_grams[position]))))
+            for position in passed
+        ]
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return self._matches(scored, limit)
+
+    def _entries(self, position):
+        refs = self._name_refs[position]
+        return refs if isinstance(refs, tuple) else (refs,)
+
+    def _matches(self, scored, limit):
+        matches = []
+        for position, score in scored:
+            for entry_id in self._entries(position):
+                if len(matches) == limit:
+                    return matches
+                matches.append({"name": self._names[position], "entry_id": entry_id, "score": score})
+        return matches
+
+    def stats(self):
+        return {
+            "pans": len(self._pans),
+            "watchlist_names": self._entry_count,
+            "distinct_watchlist_names": len(self._names),
+            "partial_name_lookups": self._partial_lookups
+        }
+
+
+def file_signature(path):
+    try:
+        stat = os.stat(path)
+    except (TypeError, FileNotFoundError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_applications(index, path, offset=0):
+    # Adds the complete "pan,application_id" rows past `offset` and returns the offset
+    # after the last one; a row still being written is left for the next call
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return offset
+    end = data.rfind(b"\n") + 1
+    for row in csv.reader(data[:end].decode().splitlines()):
+        if len(row) >= 2:
+            index.add_application(row[0], row[1])
+    return offset + end
+
+
+def build_index(applications_path=APPLICATIONS_INDEX_PATH, watchlist_path=WATCHLIST_PATH):
+    index = ScreeningIndex()
+    if applications_path:
+        index.applications_offset = read_applications(index, applications_path)
+    if watchlist_path:
+        index.watchlist_signature = file_signature(watchlist_path)
+        try:
+            with open(watchlist_path, newline="") as f:
+                index.add_watchlist_names((row[0], row[1] if len(row) > 1 else None) for row in csv.reader(f) if row)
+        except FileNotFoundError:
+            pass
+    return index
+
+
+_index = ScreeningIndex()
+_pending = None
+_reload_lock = threading.Lock()
+_file_lock = threading.Lock()
+_next_check = 0.0
+
+
+def get_index():
+    # Every serve.py worker holds its own index. Each one rebuilds when it notices the
+    # watchlist file changed, so a reload reaches all workers within SCREENING_CHECK_SECONDS
+    global _next_check
+    now = time.monotonic()
+    if WATCHLIST_PATH and now >= _next_check:
+        _next_check = now + SCREENING_CHECK_SECONDS
+        if file_signature(WATCHLIST_PATH) != _index.watchlist_signature:
+            reload_index_async()
+    return _index
+
+
+def lookup_prior_applications(pan):
+    # Other workers append to the applications file as well; catch up on it before
+    # reporting a PAN as unseen
+    index = get_index()
+    found = index.lookup_pan(pan)
+    if found or not APPLICATIONS_INDEX_PATH or not normalize_pan(pan):
+        return found
+    with _file_lock:
+        signature = file_signature(APPLICATIONS_INDEX_PATH)
+        if signature is None:
+            return found
+        if signature[1] < index.applications_offset:
+            # Rewritten rather than appended to; rebuild from the new contents
+            reload_index_async()
+            return found
+        index.applications_offset = read_applications(index, APPLICATIONS_INDEX_PATH, index.applications_offset)
+    return index.lookup_pan(pan)
+
+
+def load_index():
+    global _index
+    _index = build_index()
+    return _index
+
+
+def record_application(pan, application_id):
+    # Blocking file I/O: call from an executor thread, not the event loop
+    with _reload_lock:
+        _index.add_application(pan, application_id)
+        if _pending is not None:
+            _pending.append((pan, application_id))
+    if APPLICATIONS_INDEX_PATH and normalize_pan(pan):
+        with _file_lock, open(APPLICATIONS_INDEX_PATH, "a", newline="") as f:
+            csv.writer(f).writerow([normalize_pan(pan), application_id])
+
+
+def reload_index_async():
+    # Requests keep using the current index while the new one is built; applications
+    # recorded in the meantime are replayed onto it before the swap
+    global _pending
+
+    with _reload_lock:
+        if _pending is not None:
+            return None
+        _pending = []
+
+    def rebuild():
+        global _index, _pending
+        fresh = build_index()
+        with _reload_lock:
+            for pan, application_id in _pending:
+                fresh.add_application(pan, application_id)
+            _index = fresh
+            _pending = None
+
+    thread = threading.Thread(target=rebuild, name="screening-index-reload", daemon=True)
+    thread.start()
+    return thread